@@ -1,11 +1,14 @@
 # $Copyright (c) 2015 Software AG, Darmstadt, Germany and/or Software AG USA Inc., Reston, VA, USA, and/or Terracotta Inc., San Francisco, CA, USA, and/or Software AG (Canada) Inc., Cambridge, Ontario, Canada, and/or, Software AG (UK) Ltd., Derby, United Kingdom, and/or Software A.G. (Israel) Ltd., Or-Yehuda, Israel and/or their licensors.$
 # Use, reproduction, transfer, publication or disclosure is prohibited except as specifically provided for in your License Agreement with Software AG
 from industry.framework.BaseTest import IndustrySolutionsBaseTest
+from industry.framework.InjectionCache import cachedInjection
+from industry.framework import Benchmark
+from industry.framework.DataDiff import tolerantDiff, writeDifferences
 from pysys.basetest import BaseTest
 from pysys.constants import *
 from pysys.utils.filediff import trimContents
 from pysys.utils.filediff import replace as diffReplace
-import os
+import os, time, shutil
 
 class AnalyticsBaseTest(IndustrySolutionsBaseTest):
 	IGNORE = ['Injected MonitorScript',
@@ -31,12 +34,14 @@ class AnalyticsBaseTest(IndustrySolutionsBaseTest):
 		self.ANALYTICS_GEOLOCATION = os.path.join(self.CORE_ANALYTICS_ROOT,'GeoLocation')
 		self.ANALYTICS_STREAMING   = os.path.join(self.CORE_ANALYTICS_ROOT,'Streaming_Calculations')
 		self.ANALYTICS_UTILITIES   = os.path.join(self.CORE_ANALYTICS_ROOT,'Utilities')
+		self.ANALYTICS_PIPELINE    = os.path.join(self.CORE_ANALYTICS_ROOT,'Pipeline')
 		self.RETAIL_ANALYTICS_ROOT         = os.path.join(self.COMPONENT_MONITORS_DIR_RETAIL,'analytics','retail')
 		self.MANUFACTURING_ANALYTICS_ROOT  = os.path.join(self.COMPONENT_MONITORS_DIR_MANUFACTURING,'analytics','manufacturing')
 		self.UTILITY_ANALYTICS_ROOT         = os.path.join(self.COMPONENT_MONITORS_DIR_UTILITY,'analytics','utility')
 		self.PMMLMODELS = os.path.join(PROJECT.root, 'tools', 'models').replace("\\","/")  #We always want to use forward slashes as this is used in event params
 	
 		self.commonInjected = {}
+		self.analyticInjected = {}
 		
 	def startTest(self, Xclock=True, logfile='correlator.out', applicationEventLogging=False, 
 				  inputLog=None, logLevel="INFO", host="localhost", port=None, 
@@ -82,30 +87,56 @@ class AnalyticsBaseTest(IndustrySolutionsBaseTest):
 		
 	def injectAnalytic(self, correlator):
 		self.injectCommon(correlator)
-		correlator.injectMonitorscript(['Data.mon',
-										'Analytic.mon',
-										'Ready.mon'], self.COMPONENT_EVENT_DEFS_DIR)
-		correlator.injectMonitorscript(['AnalyticInterface.mon'], self.INTERFACES)
-		correlator.injectMonitorscript(['AnalyticObject.mon'], self.OBJECTS)
-		correlator.injectMonitorscript(['VersioningService.mon'], self.OBJECTS)
+		if not correlator in self.analyticInjected:
+			correlator.injectMonitorscript(['Data.mon',
+											'Analytic.mon',
+											'Ready.mon'], self.COMPONENT_EVENT_DEFS_DIR)
+			correlator.injectMonitorscript(['AnalyticInterface.mon'], self.INTERFACES)
+			correlator.injectMonitorscript(['AnalyticObject.mon'], self.OBJECTS)
+			correlator.injectMonitorscript(['VersioningService.mon'], self.OBJECTS)
+			self.analyticInjected[correlator] = True
+		
+		
+	def warmCorrelator(self, correlator):
+		self.injectAnalytic(correlator)
+		# InternAnalyticObject latches the Ready event, so it is re-injected between tests
+		correlator.resetMonitors.append('com.industry.analytics.InternAnalyticObject')
+		correlator.resetInjections.append((['AnalyticObject.mon'], self.OBJECTS))
+		
+		
+	def getInjectedLayers(self, correlator):
+		layers = IndustrySolutionsBaseTest.getInjectedLayers(self, correlator)
+		if correlator in self.commonInjected: layers.add('common')
+		if correlator in self.analyticInjected: layers.add('analytic')
+		return layers
+		
+		
+	def adoptWarmCorrelator(self, correlator):
+		IndustrySolutionsBaseTest.adoptWarmCorrelator(self, correlator)
+		if 'common' in correlator.warmLayers: self.commonInjected[correlator] = True
+		if 'analytic' in correlator.warmLayers: self.analyticInjected[correlator] = True
 
 	########################################
 	# DETECTORS group injection functions  #
 	########################################
+	@cachedInjection
 	def injectCorridor(self, correlator):
 		correlator.injectMonitorscript(['Corridor.mon',
 										'CorridorService.mon'], self.ANALYTICS_DETECTORS)
 
+	@cachedInjection
 	def injectDrift(self, correlator):
 		correlator.injectMonitorscript(['TimeWeightedMovingAverage.mon',
 										'TimeWeightedVariance.mon'], self.COMPONENTS)
 		correlator.injectMonitorscript(['Drift.mon',
 										'DriftService.mon'], self.ANALYTICS_DETECTORS)
 										
+	@cachedInjection
 	def injectMissingData(self, correlator):
 		correlator.injectMonitorscript(['MissingData.mon',
 										'MissingDataService.mon'], self.ANALYTICS_DETECTORS)
 
+	@cachedInjection
 	def injectPeerAnalysis(self, correlator):
 		self.injectAverage( correlator )
 		self.injectSpread( correlator )
@@ -113,6 +144,7 @@ class AnalyticsBaseTest(IndustrySolutionsBaseTest):
 		correlator.injectMonitorscript(['PeerAnalysis.mon',
 										'PeerAnalysisService.mon'], self.ANALYTICS_DETECTORS)
 
+	@cachedInjection
 	def injectSpike(self, correlator):
 		correlator.injectMonitorscript(['TimeWeightedMovingAverage.mon',
 										'TimeWeightedVariance.mon',
@@ -120,6 +152,7 @@ class AnalyticsBaseTest(IndustrySolutionsBaseTest):
 		correlator.injectMonitorscript(['Spike.mon',
 										'SpikeService.mon'], self.ANALYTICS_DETECTORS)
 
+	@cachedInjection
 	def injectThreshold(self, correlator):
 		correlator.injectMonitorscript(['Threshold.mon',
 										'ThresholdService.mon'], self.ANALYTICS_DETECTORS)
@@ -127,6 +160,7 @@ class AnalyticsBaseTest(IndustrySolutionsBaseTest):
 	########################################
 	# EXTENSIONS group injection functions #
 	########################################
+	@cachedInjection
 	def injectPrediction(self, correlator):
 		correlator.injectJava('Predictive-Analytics-Plugin.jar', os.path.join(self.APAMA_HOME,'adapters','lib'))
 		correlator.injectCDP(['predictive_analytics_plugin_monitors.cdp'], self.APAMA_ADAPTER_MONITORS_DIR)
@@ -136,46 +170,57 @@ class AnalyticsBaseTest(IndustrySolutionsBaseTest):
 	###############################################
 	# FLOW_MANIPULATION group injection functions #
 	###############################################
+	@cachedInjection
 	def injectCombiner(self, correlator):
 		correlator.injectMonitorscript(['Combiner.mon',
 										'CombinerService.mon'], self.ANALYTICS_FLOW)
 
+	@cachedInjection
 	def injectDuplicator(self, correlator):
 		correlator.injectMonitorscript(['Duplicator.mon',
 										'DuplicatorService.mon'], self.ANALYTICS_FLOW)
 
+	@cachedInjection
 	def injectEventRate(self, correlator):
 		correlator.injectMonitorscript(['EventRate.mon',
 										'EventRateService.mon'], self.ANALYTICS_FLOW)
 
+	@cachedInjection
 	def injectFilter(self, correlator):
 		correlator.injectMonitorscript(['Filter.mon',
 										'FilterService.mon'], self.ANALYTICS_FLOW)
 
+	@cachedInjection
 	def injectMapper(self, correlator):
 		correlator.injectMonitorscript(['Mapper.mon',
 										'MapperService.mon'], self.ANALYTICS_FLOW)
 										
+	@cachedInjection
 	def injectMerger(self, correlator):
 		correlator.injectMonitorscript(['Merger.mon',
 										'MergerService.mon'], self.ANALYTICS_FLOW)
 
+	@cachedInjection
 	def injectRepeater(self, correlator):
 		correlator.injectMonitorscript(['Repeater.mon',
 										'RepeaterService.mon'], self.ANALYTICS_FLOW)
 
+	@cachedInjection
 	def injectSorter(self, correlator):
 		correlator.injectMonitorscript(['Sorter.mon',
 										'SorterService.mon'], self.ANALYTICS_FLOW)
 
+	@cachedInjection
 	def injectSlicer(self, correlator):
 		correlator.injectMonitorscript(['Slicer.mon',
 										'SlicerService.mon'], self.ANALYTICS_FLOW)
 
+	@cachedInjection
 	def injectSuppressor(self, correlator):
 		correlator.injectMonitorscript(['Suppressor.mon',
 										'SuppressorService.mon'], self.ANALYTICS_FLOW)
 										
+	@cachedInjection
 	def injectThrottler(self, correlator):
 		correlator.injectMonitorscript(['Throttler.mon',
 										'ThrottlerService.mon'], self.ANALYTICS_FLOW)
@@ -183,15 +228,18 @@ class AnalyticsBaseTest(IndustrySolutionsBaseTest):
 	#########################################
 	# GEOLOCATION group injection functions #
 	#########################################
+	@cachedInjection
 	def injectGeoFence(self, correlator):
 		correlator.injectMonitorscript(['GeoFence.mon',
 										'GeoFenceService.mon'], self.ANALYTICS_GEOLOCATION)
 
+	@cachedInjection
 	def injectDistance(self, correlator):
 		correlator.injectMonitorscript(['GeoUtil.mon'], self.COMPONENTS)
 		correlator.injectMonitorscript(['Distance.mon',
 										'DistanceService.mon'], self.ANALYTICS_GEOLOCATION)
 
+	@cachedInjection
 	def injectSpeed(self, correlator):
 		correlator.injectMonitorscript(['GeoUtil.mon'], self.COMPONENTS)
 		correlator.injectMonitorscript(['Speed.mon',
@@ -200,68 +248,84 @@ class AnalyticsBaseTest(IndustrySolutionsBaseTest):
 	#########################################
 	# MANFACTURING group injection functions #
 	#########################################
+	@cachedInjection
 	def injectCommonManufacturing(self, correlator):
 		correlator.injectMonitorscript(['BucketSystem.mon'], self.COMPONENTS)
 		correlator.injectMonitorscript(['ManufacturingConstants.mon'], self.MANUFACTURING_ANALYTICS_ROOT)
 	
+	@cachedInjection
 	def injectAvailability(self, correlator):
 		correlator.injectMonitorscript(['Availability.mon', 'AvailabilityService.mon'], self.MANUFACTURING_ANALYTICS_ROOT)
 		
+	@cachedInjection
 	def injectPerformance(self, correlator):
 		correlator.injectMonitorscript(['Performance.mon', 'PerformanceService.mon'], self.MANUFACTURING_ANALYTICS_ROOT)
 		
+	@cachedInjection
 	def injectQuality(self, correlator):
 		correlator.injectMonitorscript(['Quality.mon', 'QualityService.mon'], self.MANUFACTURING_ANALYTICS_ROOT)
 		
+	@cachedInjection
 	def injectOEE(self, correlator):
 		correlator.injectMonitorscript(['OEE.mon', 'OEEService.mon'], self.MANUFACTURING_ANALYTICS_ROOT)
 		
+	@cachedInjection
 	def injectResourceUsage(self, correlator):
 		correlator.injectMonitorscript(['ResourceUsage.mon', 'ResourceUsageService.mon'], self.MANUFACTURING_ANALYTICS_ROOT)
 
 	####################################################
 	# STREAMING_CALCULATIONS group injection functions #
 	####################################################
+	@cachedInjection
 	def injectAverage(self, correlator):
 		correlator.injectMonitorscript(['TimeWeightedMovingAverage.mon'], self.COMPONENTS)
 		correlator.injectMonitorscript(['Average.mon',
 										'AverageService.mon'], self.ANALYTICS_STREAMING)
 
+	@cachedInjection
 	def injectDelta(self, correlator):
 		correlator.injectMonitorscript(['Delta.mon',
 										'DeltaService.mon'], self.ANALYTICS_STREAMING)
 
+	@cachedInjection
 	def injectExpression(self, correlator):
 		correlator.injectMonitorscript(['Expression.mon',
 										'ExpressionService.mon'], self.ANALYTICS_STREAMING)
 	
+	@cachedInjection
 	def injectFFTAnalysis(self, correlator):
 		correlator.injectMonitorscript(['ComplexNumber.mon',
 										'fft.mon'], self.COMPONENTS)
 		correlator.injectMonitorscript(['FFTAnalysis.mon',
 										'FFTAnalysisService.mon'], self.ANALYTICS_STREAMING)
 	
+	@cachedInjection
 	def injectGradient(self, correlator):
 		correlator.injectMonitorscript(['Gradient.mon',
 										'GradientService.mon'], self.ANALYTICS_STREAMING)
 
+	@cachedInjection
 	def injectMinMax(self, correlator):
 		correlator.injectMonitorscript(['MinMax.mon',
 										'MinMaxService.mon'], self.ANALYTICS_STREAMING)
 
+	@cachedInjection
 	def injectMode(self, correlator):
 		correlator.injectMonitorscript(['Mode.mon',
 										'ModeService.mon'], self.ANALYTICS_STREAMING)
 
+	@cachedInjection
 	def injectSpread(self, correlator):
 		correlator.injectMonitorscript(['Spread.mon',
 										'SpreadService.mon'], self.ANALYTICS_STREAMING)
 
+	@cachedInjection
 	def injectSum(self, correlator):
 		correlator.injectMonitorscript(['TimeWeightedMovingAverage.mon'], self.COMPONENTS)
 		correlator.injectMonitorscript(['Sum.mon',
 										'SumService.mon'], self.ANALYTICS_STREAMING)
 
+	@cachedInjection
 	def injectVolatility(self, correlator):
 		correlator.injectMonitorscript(['TimeWeightedMovingAverage.mon',
 										'TimeWeightedVariance.mon'], self.COMPONENTS)
@@ -271,14 +335,17 @@ class AnalyticsBaseTest(IndustrySolutionsBaseTest):
 	#######################################
 	# RETAIL group injection functions #
 	#######################################	
+	@cachedInjection
 	def injectCommonRetail(self, correlator):
 		correlator.injectMonitorscript(['BucketSystem.mon'], self.COMPONENTS)
 		
+	@cachedInjection
 	def injectBasketAnalysis(self, correlator):
 		correlator.injectMonitorscript(['TimeWeightedMovingAverage.mon'], self.COMPONENTS)
 		correlator.injectMonitorscript(['BasketAnalysis.mon',
 										'BasketAnalysisService.mon'], self.RETAIL_ANALYTICS_ROOT)
 										
+	@cachedInjection
 	def injectFootFall(self, correlator):
 		self.injectGeoFence( correlator )
 		self.injectMapper( correlator )
@@ -286,31 +353,38 @@ class AnalyticsBaseTest(IndustrySolutionsBaseTest):
 		correlator.injectMonitorscript(['FootFall.mon',
 										'FootFallService.mon'], self.RETAIL_ANALYTICS_ROOT)
 	
+	@cachedInjection
 	def injectSalesPerArea(self, correlator):
 		self.injectSum( correlator )
 		correlator.injectMonitorscript(['SalesPerArea.mon',
 										'SalesPerAreaService.mon'], self.RETAIL_ANALYTICS_ROOT)
 										
+	@cachedInjection
 	def injectOnTimeArrival(self, correlator):
 		correlator.injectMonitorscript(['OnTimeArrival.mon','OnTimeArrivalService.mon'], self.RETAIL_ANALYTICS_ROOT)
 	
+	@cachedInjection
 	def injectTimeOverdue(self, correlator):
 		correlator.injectMonitorscript(['TimeOverdue.mon', 'TimeOverdueService.mon'], self.RETAIL_ANALYTICS_ROOT)
 		
+	@cachedInjection
 	def injectInventoryDays(self, correlator):
 		correlator.injectMonitorscript(['TimeWeightedMovingAverage.mon'], self.COMPONENTS)
 		correlator.injectMonitorscript(['InventoryDays.mon', 'InventoryDaysService.mon'], self.RETAIL_ANALYTICS_ROOT)
 
+	@cachedInjection
 	def injectCategoryContribution(self, correlator):
 		self.injectSum( correlator )
 		correlator.injectMonitorscript(['CategoryContribution.mon',
 										'CategoryContributionService.mon'], self.RETAIL_ANALYTICS_ROOT)
 
+	@cachedInjection
 	def injectSalesPerVisitor(self, correlator):
 		correlator.injectMonitorscript(['BucketSystem.mon'], self.COMPONENTS)
 		correlator.injectMonitorscript(['SalesPerVisitor.mon',
 										'SalesPerVisitorService.mon'], self.RETAIL_ANALYTICS_ROOT)
 										
+	@cachedInjection
 	def injectProjectedInventory(self, correlator):
 		self.injectInventoryDays( correlator )
 		correlator.injectMonitorscript(['ProjectedInventory.mon',
@@ -319,36 +393,43 @@ class AnalyticsBaseTest(IndustrySolutionsBaseTest):
 	#######################################
 	# UTILITY group injection functions #
 	#######################################	
+	@cachedInjection
 	def injectSAIDI(self, correlator):
 		correlator.injectMonitorscript(['BucketSystem.mon'], self.COMPONENTS)
 		correlator.injectMonitorscript(['SAIDI.mon',
 										'SAIDIService.mon'], self.UTILITY_ANALYTICS_ROOT)
 										
+	@cachedInjection
 	def injectCAIDI(self, correlator):
 		correlator.injectMonitorscript(['BucketSystem.mon'], self.COMPONENTS)
 		correlator.injectMonitorscript(['CAIDI.mon',
 										'CAIDIService.mon'], self.UTILITY_ANALYTICS_ROOT)
 	
+	@cachedInjection
 	def injectSAIFI(self, correlator):
 		correlator.injectMonitorscript(['BucketSystem.mon'], self.COMPONENTS)
 		correlator.injectMonitorscript(['SAIFI.mon',
 										'SAIFIService.mon'], self.UTILITY_ANALYTICS_ROOT)
 										
+	@cachedInjection
 	def injectCAIFI(self, correlator):
 		correlator.injectMonitorscript(['BucketSystem.mon'], self.COMPONENTS)
 		correlator.injectMonitorscript(['CAIFI.mon',
 										'CAIFIService.mon'], self.UTILITY_ANALYTICS_ROOT)
 										
+	@cachedInjection
 	def injectCIII(self, correlator):
 		correlator.injectMonitorscript(['BucketSystem.mon'], self.COMPONENTS)
 		correlator.injectMonitorscript(['CIII.mon',
 										'CIIIService.mon'], self.UTILITY_ANALYTICS_ROOT)
 										
+	@cachedInjection
 	def injectMAIFI(self, correlator):
 		correlator.injectMonitorscript(['BucketSystem.mon'], self.COMPONENTS)
 		correlator.injectMonitorscript(['MAIFI.mon',
 										'MAIFIService.mon'], self.UTILITY_ANALYTICS_ROOT)
 										
+	@cachedInjection
 	def injectASAI(self, correlator):
 		correlator.injectMonitorscript(['BucketSystem.mon'], self.COMPONENTS)
 		correlator.injectMonitorscript(['ASAI.mon',
@@ -356,23 +437,46 @@ class AnalyticsBaseTest(IndustrySolutionsBaseTest):
 	#######################################
 	# UTILITIES group injection functions #
 	#######################################
+	@cachedInjection
 	def injectDataViewer(self, correlator):
 		correlator.injectMonitorscript(['DataViewReflector.mon'], self.REFLECTORS)
 		correlator.injectMonitorscript(['DataViewer.mon',
 										'DataViewerService.mon'], self.ANALYTICS_UTILITIES)
 
+	@cachedInjection
 	def injectLogger(self, correlator):
 		correlator.injectMonitorscript(['Logger.mon',
 										'LoggerService.mon'], self.ANALYTICS_UTILITIES)
 
+	@cachedInjection
 	def injectMemoryStore(self, correlator):
+		# The stores opened by the MemoryStore Analytic cannot be closed, so a pooled correlator is not reused
+		if correlator.pooled: correlator.reusable = False
 		correlator.injectMonitorscript(['MemoryStore.mon',
 										'MemoryStoreService.mon'], self.ANALYTICS_UTILITIES)
 
+	@cachedInjection
 	def injectDataSimulator(self, correlator):
 		correlator.injectMonitorscript(['DataSimulator.mon',
 										'DataSimulatorService.mon'], self.ANALYTICS_UTILITIES)
 
+	######################################
+	# PIPELINE group injection functions #
+	######################################
+	@cachedInjection
+	def injectPipeline(self, correlator):
+		# The Pipeline can create any of the core Analytics, so requires them all
+		for analytic in ['Corridor', 'Drift', 'MissingData', 'PeerAnalysis', 'Spike', 'Threshold',
+					  'Combiner', 'Duplicator', 'EventRate', 'Filter', 'Mapper', 'Merger', 'Repeater',
+					  'Slicer', 'Sorter', 'Suppressor', 'Throttler',
+					  'Distance', 'GeoFence', 'Speed',
+					  'Average', 'Delta', 'Expression', 'FFTAnalysis', 'Gradient', 'MinMax', 'Mode',
+					  'Spread', 'Sum', 'Volatility',
+					  'DataSimulator', 'DataViewer', 'Logger', 'MemoryStore']:
+			getattr(self, 'inject' + analytic)(correlator)
+		correlator.injectMonitorscript(['Pipeline.mon',
+										'PipelineService.mon'], self.ANALYTICS_PIPELINE)
+
 	#########################################
 	# Utility functions to inject test code #
 	#########################################
@@ -394,19 +498,101 @@ class AnalyticsBaseTest(IndustrySolutionsBaseTest):
 	#########################################
 	# Utility functions for test validation #
 	#########################################
-	def assertDiff(self, file1, file2, filedir1=None, filedir2=None, ignores=[], sort=False, replace=[], includes=[], forceFriendlyFilesCreation=False, **xargs):
-		'''Same semantic of the superclass, however in case of failure, it writes files easier to compare.
+	def assertDiff(self, file1, file2, filedir1=None, filedir2=None, ignores=[], sort=False, replace=[], includes=[], forceFriendlyFilesCreation=False, 
+				   relTolerance=None, absTolerance=None, diffWindow=20, **xargs):
+		'''Same semantic of the superclass, however Data event values may optionally differ within a tolerance.
+
+		Both files are streamed through the same comparator, so large outputs are never loaded in full
+		(unless C{sort} is set). If a relative or absolute tolerance is given, either as an argument or
+		with the C{diffRelTolerance} and C{diffAbsTolerance} extra arguments, the dValue, xValue, yValue and
+		zValue fields of Data events are compared numerically within the tolerance, and all other fields and
+		lines must match exactly. Without a tolerance all lines must match exactly. In case of failure the
+		first C{diffWindow} differing lines are written to a file ending in C{.diff.txt}, and the full
+		compare friendly files are only written if forced.
 		'''
-		BaseTest.assertDiff(self, file1, file2, filedir1, filedir2, ignores, sort, replace, includes);
-		if (PASSED != self.outcome[-1]) or forceFriendlyFilesCreation:
-			if filedir1 is None: filedir1 = self.output
-			if filedir2 is None: filedir2 = self.reference
-			f1 = os.path.join(filedir1, file1)
-			f2 = os.path.join(filedir2, file2)
-			self.log.info("Files differ: producing compare friendly files")
+		if filedir1 is None: filedir1 = self.output
+		if filedir2 is None: filedir2 = self.reference
+		f1 = os.path.join(filedir1, file1)
+		f2 = os.path.join(filedir2, file2)
+		if relTolerance == None: relTolerance = float(getattr(self, 'diffRelTolerance', 0.0))
+		if absTolerance == None: absTolerance = float(getattr(self, 'diffAbsTolerance', 0.0))
+
+		try:
+			result = tolerantDiff(f1, f2, ignores, sort, replace, includes, relTolerance, absTolerance, diffWindow)
+		except IOError, e:
+			self.log.info("Caught IOError comparing files: %s", e)
+			self.addOutcome(BLOCKED)
+			return
+		self.addOutcome(PASSED if result.passed() else FAILED)
+		if relTolerance > 0 or absTolerance > 0:
+			self.log.info("File comparison between %s and %s within tolerance ... %s", file1, file2, LOOKUP[self.outcome[-1]].lower())
+		else:
+			self.log.info("File comparison between %s and %s ... %s", file1, file2, LOOKUP[self.outcome[-1]].lower())
+
+		if FAILED == self.outcome[-1]:
+			writeDifferences(f1 + ".diff.txt", result)
+			self.log.info("Files differ on %d lines: the first are written to %s", result.count, os.path.basename(f1) + ".diff.txt")
+			for lineNumber, line1, line2 in result.differences[:3]:
+				self.log.info("  line %d: %s", lineNumber, line1)
+				self.log.info("  expected: %s", line2)
+		if forceFriendlyFilesCreation:
+			self.log.info("Producing compare friendly files")
 			self.produceCompareFriendlyFiles(f1, f2, ignores, sort, replace, includes)
 
 
+	def assertBenchmark(self, eventRateFile='EventRate.evt', correlatorLog='correlator.out', 
+						baselineFile='benchmark.json', thresholds=None, discard=1):
+		"""Measure the throughput, latency and memory of a performance run and compare them against a baseline.
+
+		The results are written as JSON to the test output directory, and additionally to the directory 
+		given by the C{benchmarkDir} extra argument if it is set. A C{PASSED} outcome is added if no metric 
+		is worse than the baseline in the test reference directory by more than its threshold, otherwise a 
+		C{FAILED} outcome is added. If there is no baseline a C{NOTVERIFIED} outcome is added; running with 
+		the C{updateBenchmarkBaseline=true} extra argument stores the results of the run as the baseline.
+
+		@param eventRateFile: The basename of the file the EventRate analytic output was received into
+		@param correlatorLog: The basename of the log file of the correlator running the analytics
+		@param baselineFile: The basename of the baseline file in the test reference directory
+		@param thresholds: Optional dictionary overriding the regression threshold of each metric
+		@param discard: The number of leading event rate samples to ignore as warm-up
+
+		"""
+		results = Benchmark.measure(os.path.join(self.output, eventRateFile),
+									os.path.join(self.output, correlatorLog), discard)
+		results['testId'] = self.descriptor.id
+		results['timestamp'] = time.time()
+		for metric in ['eventsPerSecond', 'latencyP50', 'latencyP99', 'peakResidentKB']:
+			self.log.info("Benchmark %s: %s", metric, results[metric])
+
+		resultFile = os.path.join(self.output, baselineFile)
+		Benchmark.save(resultFile, results)
+		benchmarkDir = getattr(self, 'benchmarkDir', None)
+		if benchmarkDir:
+			if not os.path.exists(benchmarkDir): os.makedirs(benchmarkDir)
+			shutil.copyfile(resultFile, os.path.join(benchmarkDir, '%s-%d.json' % (self.descriptor.id, int(results['timestamp']))))
+
+		if results['eventsPerSecond'] == None:
+			self.log.info("Benchmark produced no event rate samples")
+			self.addOutcome(FAILED)
+			return results
+
+		reference = os.path.join(self.reference, baselineFile)
+		if str(getattr(self, 'updateBenchmarkBaseline', 'false')).lower() == 'true':
+			if not os.path.exists(self.reference): os.makedirs(self.reference)
+			shutil.copyfile(resultFile, reference)
+			self.log.info("Benchmark baseline updated")
+		if not os.path.exists(reference):
+			self.log.info("No benchmark baseline found at %s", reference)
+			self.addOutcome(NOTVERIFIED)
+			return results
+
+		regressions = Benchmark.compare(results, Benchmark.load(reference), thresholds)
+		for metric, value, expected, change in regressions:
+			self.log.info("Benchmark %s regressed by %.1f%%: %s (baseline %s)", metric, change * 100, value, expected)
+		self.addOutcome(FAILED if regressions else PASSED)
+		return results
+
+
 	def produceCompareFriendlyFiles(self, file1, file2, ignore=[], sort=True, replacementList=[], include=[]):
 		list1 = []
 		list2 = []
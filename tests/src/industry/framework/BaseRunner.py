@@ -7,6 +7,7 @@ from pysys.utils.threadpool import *
 from pysys.baserunner import TestContainer
 from apama.runner import ApamaRunner
 from copy import copy
+from industry.framework import PortAllocator, CorrelatorPool, InjectionCache
 
 
 class IndustrySolutionsRunner(ApamaRunner):
@@ -16,6 +17,32 @@ class IndustrySolutionsRunner(ApamaRunner):
         if xargs.has_key('level'):
         	Constants.LOG_LEVEL = xargs['level']
 
+        # Configure the allocator that leases correlator ports to the tests, so that 
+        # tests running on separate worker threads (or runners) never share a port
+        portRange = PortAllocator.DEFAULT_PORT_RANGE
+        if xargs.has_key('portRange'):
+            portRange = tuple(map(int, xargs['portRange'].split('-')))
+        self.portAllocator = PortAllocator.configure(portRange=portRange,
+                                                     leaseDir=xargs.get('leaseDir', PortAllocator.DEFAULT_LEASE_DIR))
+
+        # Optionally keep a pool of warm correlators that are reused across tests; the 
+        # size of the pool defaults to the number of worker threads
+        poolSize = 0
+        if xargs.has_key('correlatorPool'):
+            if xargs['correlatorPool'].lower() == 'true':
+                poolSize = max(threads, 1)
+            elif xargs['correlatorPool'].lower() != 'false':
+                poolSize = int(xargs['correlatorPool'])
+        self.correlatorPool = CorrelatorPool.configure(poolSize,
+                                                       os.path.join(self.portAllocator.scratchRoot, 'pool-%d' % os.getpid()),
+                                                       self.portAllocator)
+
+        # Optionally inject the dependency closure of each analytic inject helper as a single cached CDP
+        InjectionCache.configure(xargs.get('cdpCache', 'false').lower() == 'true',
+                                 xargs.get('cdpCacheDir', InjectionCache.DEFAULT_CACHE_DIR))
+        self.workerDurations = {}
+        self.workerTestCounts = {}
+
 
 #    def setup(self):
 #        """Setup method which performs custom setup operations prior to execution of a set of testcases.
@@ -34,6 +61,12 @@ class IndustrySolutionsRunner(ApamaRunner):
         # This should be in base PySys
         # Make sure that a NOTVERIFIED is actually recorded so that the output is not purged
         if len(testObj.outcome) == 0: testObj.addOutcome(NOTVERIFIED)
+
+        # Record the time spent by the worker that executed the test
+        worker = getattr(testObj, 'workerName', None)
+        if worker != None:
+            self.workerDurations[worker] = self.workerDurations.get(worker, 0.0) + getattr(testObj, 'testDuration', 0.0)
+            self.workerTestCounts[worker] = self.workerTestCounts.get(worker, 0) + 1
         ApamaRunner.testComplete(self, testObj, dir)
 
 
@@ -44,11 +77,14 @@ class IndustrySolutionsRunner(ApamaRunner):
         ApamaRunner.cycleComplete(self)
 
 
-#    def cleanup(self):
-#        """Cleanup method which performs custom cleanup operations after execution of all testcases.
-#        
-#        """
-#        ApamaRunner.cleanup(self)
+    def cleanup(self):
+        """Cleanup method which performs custom cleanup operations after execution of all testcases.
+        
+        """
+        if self.correlatorPool != None: self.correlatorPool.shutdown()
+        self.portAllocator.releaseAll()
+        self.portAllocator.removeScratchDirs()
+        ApamaRunner.cleanup(self)
 
 
     # Override the default printSummary() to list tests needing inspection
@@ -61,6 +97,9 @@ class IndustrySolutionsRunner(ApamaRunner):
         if self.threads > 1: 
             log.critical("Test duration (absolute): %.2f (secs)", time.time() - self.startTime)        
             log.critical("Test duration (additive): %.2f (secs)", self.duration)
+            for worker in sorted(self.workerDurations.keys()):
+                log.critical("    %s: %.2f (secs) additive over %d tests", worker,
+                             self.workerDurations[worker], self.workerTestCounts[worker])
         else:
             log.critical("Test duration: %.2f (secs)", time.time() - self.startTime)        
         log.critical("")        
@@ -7,8 +7,12 @@ from apama.common import XArgsHolder
 from apama.common import stringToUnicode
 from apama.iaf import IAFHelper
 from industry.framework.Correlator import IndustrySolutionsCorrelatorHelper
-from industry.framework.GrepUtils import orderedgrep
-import os, re, platform, time, shutil
+from industry.framework.GrepUtils import orderedgrep, orderedgrepMany
+from industry.framework.PortAllocator import getPortAllocator
+from industry.framework.CorrelatorPool import getCorrelatorPool
+from industry.framework.LogWatcher import LogWatcher
+from industry.framework.KitLayout import getKitLayout
+import os, re, platform, time, shutil, threading
 import subprocess
 from pysys import log
 
@@ -17,6 +21,14 @@ class IndustrySolutionsBaseTest(BaseTest):
 	def __init__(self, descriptor, outsubdir, runner):
 		BaseTest.__init__(self, descriptor, outsubdir, runner)
 		
+		self.workerName    = threading.currentThread().getName()
+		self.testStartTime = time.time()
+		self.testDuration  = 0.0
+		self.portAllocator = getPortAllocator()
+		self.leasedPorts   = []
+		self.pooledCorrelators = []
+		self.logWatcher    = LogWatcher()
+
 		self.APAMA_HOME = getattr(PROJECT,"APAMA_HOME")
 		self.APAMA_MONITORS_DIR = os.path.join( self.APAMA_HOME, 'monitors')
 		self.APAMA_ADAPTER_MONITORS_DIR = os.path.join( self.APAMA_HOME,'adapters', 'monitors')
@@ -29,59 +41,17 @@ class IndustrySolutionsBaseTest(BaseTest):
 		self.COMPONENT_SOURCE_DIR     = os.path.join(self.COMPONENT_HOME, 'src')
 		self.COMPONENT_BUILD_FILE     = os.path.join(self.COMPONENT_SOURCE_DIR, 'build.xml')
 
-		outputdir = os.path.join(self.COMPONENT_HOME, 'output', 'windows')
-		outputdirfolders = [p for p in map(lambda d: os.path.join(outputdir, d),os.listdir(outputdir)) if os.path.isdir(p)]
-		
-		# Get the versioned directory
-		version_path = (p for p in outputdirfolders if not ' for ' in os.path.basename(p)).next()
-		self.COMPONENT_EPL_HOME       = os.path.join(version_path, 'Industry Analytics Kit' )
-		self.COMPONENT_CONFIG_DIR     = os.path.join(self.COMPONENT_EPL_HOME, 'config')
-		self.COMPONENT_EVENT_DEFS_DIR = os.path.join(self.COMPONENT_EPL_HOME, 'eventdefinitions')
-		self.COMPONENT_OBJECTS_DIR    = os.path.join(self.COMPONENT_EPL_HOME, 'objects')
-		self.COMPONENT_MONITORS_DIR   = os.path.join(self.COMPONENT_EPL_HOME, 'monitors')
-		self.COMPONENT_QUERIES_DIR    = os.path.join(self.COMPONENT_EPL_HOME, 'queries')
-
-		# Get the versioned directory for Retail
-		version_path_retail = (p for p in outputdirfolders if ' for Retail' in os.path.basename(p)).next()
-		self.COMPONENT_EPL_HOME_RETAIL = os.path.join(version_path_retail, 'Industry Analytics Kit' )
-		self.COMPONENT_CONFIG_DIR_RETAIL     = os.path.join(self.COMPONENT_EPL_HOME_RETAIL, 'config')
-		self.COMPONENT_EVENT_DEFS_DIR_RETAIL = os.path.join(self.COMPONENT_EPL_HOME_RETAIL, 'eventdefinitions')
-		self.COMPONENT_OBJECTS_DIR_RETAIL    = os.path.join(self.COMPONENT_EPL_HOME_RETAIL, 'objects')
-		self.COMPONENT_MONITORS_DIR_RETAIL   = os.path.join(self.COMPONENT_EPL_HOME_RETAIL, 'monitors')
-		self.COMPONENT_QUERIES_DIR_RETAIL    = os.path.join(self.COMPONENT_EPL_HOME_RETAIL, 'queries')
-		
-		# Get the versioned directory for Maufacturing
-		version_path_manufacturing = (p for p in outputdirfolders if ' for Manufacturing' in os.path.basename(p)).next()
-		self.COMPONENT_EPL_HOME_MANUFACTURING = os.path.join(version_path_manufacturing, 'Industry Analytics Kit' )
-		self.COMPONENT_CONFIG_DIR_MANUFACTURING = os.path.join(self.COMPONENT_EPL_HOME_MANUFACTURING, 'config')
-		self.COMPONENT_EVENT_DEFS_DIR_MANUFACTURING = os.path.join(self.COMPONENT_EPL_HOME_MANUFACTURING, 'eventdefinitions')
-		self.COMPONENT_OBJECTS_DIR_MANUFACTURING = os.path.join(self.COMPONENT_EPL_HOME_MANUFACTURING, 'objects')
-		self.COMPONENT_MONITORS_DIR_MANUFACTURING = os.path.join(self.COMPONENT_EPL_HOME_MANUFACTURING, 'monitors')
-		self.COMPONENT_QUERIES_DIR_MANUFACTURING = os.path.join(self.COMPONENT_EPL_HOME_MANUFACTURING, 'queries')
-
-		# Get the versioned directory for Utility
-		version_path_utility = (p for p in outputdirfolders if ' for Utility' in os.path.basename(p)).next()
-		self.COMPONENT_EPL_HOME_UTILITY = os.path.join(version_path_utility, 'Industry Analytics Kit' )
-		self.COMPONENT_CONFIG_DIR_UTILITY     = os.path.join(self.COMPONENT_EPL_HOME_UTILITY, 'config')
-		self.COMPONENT_EVENT_DEFS_DIR_UTILITY = os.path.join(self.COMPONENT_EPL_HOME_UTILITY, 'eventdefinitions')
-		self.COMPONENT_OBJECTS_DIR_UTILITY    = os.path.join(self.COMPONENT_EPL_HOME_UTILITY, 'objects')
-		self.COMPONENT_MONITORS_DIR_UTILITY   = os.path.join(self.COMPONENT_EPL_HOME_UTILITY, 'monitors')
-		self.COMPONENT_QUERIES_DIR_UTILITY    = os.path.join(self.COMPONENT_EPL_HOME_UTILITY, 'queries')
-		
+		# Get the versioned directories of the core kit and each of the industry kits
+		for name, path in getKitLayout().getLayout(self.COMPONENT_HOME).items(): setattr(self, name, path)
+
 		self.OUTPUT_DIR = outsubdir
 		self.currDir    = os.getcwd()
 
-		self.environ = {} 
-		for key in os.environ: self.environ[stringToUnicode(key)] = stringToUnicode(os.environ[key])
-		self.environ['CLASSPATH'] = ''
-		self.environ['CLASSPATH'] = os.path.join(self.ANT_HOME) + ENVSEPERATOR + self.environ['CLASSPATH']
-		self.environ['CLASSPATH'] = os.path.join(self.ANT_HOME, 'lib', 'ant-launcher.jar') + ENVSEPERATOR + self.environ['CLASSPATH']
-		self.environ['CLASSPATH'] = os.path.join(getattr(PROJECT,"APAMA_HOME"), 'lib', 'engine_client%s.jar' % getattr(PROJECT,"APAMA_LIBRARY_VERSION")) + ENVSEPERATOR + self.environ['CLASSPATH']
-		self.environ['CLASSPATH'] = os.path.join(getattr(PROJECT,"APAMA_HOME"), 'lib', 'util%s.jar' % getattr(PROJECT,"APAMA_LIBRARY_VERSION")) + ENVSEPERATOR + self.environ['CLASSPATH']
-		self.environ['CLASSPATH'] = os.path.join(PROJECT.root, 'tools', 'classes') + ENVSEPERATOR + self.environ['CLASSPATH']
-		self.environ['CLASSPATH'] = os.path.join(getattr(PROJECT,"APAMA_HOME"), 'lib') + ENVSEPERATOR + self.environ['CLASSPATH']
-		self.environ['CLASSPATH'] = os.path.join(getattr(PROJECT,"APAMA_HOME"), 'bin') + ENVSEPERATOR + self.environ['CLASSPATH']
-		self.environ['CLASSPATH'] = stringToUnicode(self.environ['CLASSPATH'])
+		# Give each worker its own temporary directory so that concurrently running
+		# correlators and tools do not share temporary files
+		self.WORKER_SCRATCH_DIR = self.portAllocator.getScratchDir()
+		self.environ = getKitLayout().getEnviron({'TMP':  stringToUnicode(self.WORKER_SCRATCH_DIR),
+												  'TEMP': stringToUnicode(self.WORKER_SCRATCH_DIR)})
 		
 		self.buildsRun = -1
 
@@ -101,23 +71,38 @@ class IndustrySolutionsBaseTest(BaseTest):
 				  startAntTargets=[], extraAntProperties={},
 				  **xargs):
 		
-		# Create a Correlator Helper    
-		self.correlator = IndustrySolutionsCorrelatorHelper(self, host=host, port=port)
-		
-		# If there are extra JAR files to include
-		for jarPath in extraJars:
-			self.correlator.addToClassPath( jarPath )
+		# Lease a warm correlator from the pool if pooled mode is enabled, and the
+		# correlator requested is the default configuration the pool provides
+		pool = getCorrelatorPool()
+		self.correlator = None
+		if pool != None and Xclock and host == "localhost" and port == None and \
+		   not (applicationEventLogging or inputLog or enableLLVM or enableJava or enableJMS or 
+				persistence or distMemStoreConfig or extraJars):
+			self.correlator = pool.lease(self, logfile, logLevel, startTime)
+			if self.correlator != None: self.pooledCorrelators.append(self.correlator)
+
+		if self.correlator == None:
+			# Lease a port that no other test or runner can be using
+			if port == None and host == "localhost":
+				port = self.allocatePort()
+
+			# Create a Correlator Helper    
+			self.correlator = IndustrySolutionsCorrelatorHelper(self, host=host, port=port)
 			
-		# Start the Correlator
-		self.correlator.start(Xclock=Xclock, logfile=logfile, verbosity=logLevel, 
-							  applicationEventLogging=applicationEventLogging, 
-							  inputLog=inputLog,
-							  java=enableJava, enableLLVM=enableLLVM, enableJMS=enableJMS,
-							  jmsConfigPath=jmsConfigPath,
-							  startTime=startTime, persistence=persistence,
-							  persistenceStoreName=persistenceStoreName,
-							  persistenceStoreLocation=persistenceStoreLocation,
-							  distMemStoreConfig=distMemStoreConfig)
+			# If there are extra JAR files to include
+			for jarPath in extraJars:
+				self.correlator.addToClassPath( jarPath )
+				
+			# Start the Correlator
+			self.correlator.start(Xclock=Xclock, logfile=logfile, verbosity=logLevel, 
+								  applicationEventLogging=applicationEventLogging, 
+								  inputLog=inputLog,
+								  java=enableJava, enableLLVM=enableLLVM, enableJMS=enableJMS,
+								  jmsConfigPath=jmsConfigPath,
+								  startTime=startTime, persistence=persistence,
+								  persistenceStoreName=persistenceStoreName,
+								  persistenceStoreLocation=persistenceStoreLocation,
+								  distMemStoreConfig=distMemStoreConfig)
 		
 		# Log any test output to the output log
 		self.correlator.receive(outputLog, channels=['TEST_OUT'])
@@ -144,6 +129,54 @@ class IndustrySolutionsBaseTest(BaseTest):
 
 		return self.correlator
 
+	def allocatePort(self):
+		"""Lease a port that is unique across all worker threads and test processes on this host.
+
+		The port is released automatically when the test is cleaned up.
+
+		"""
+		port = self.portAllocator.allocate(owner=self.descriptor.id)
+		self.leasedPorts.append(port)
+		return port
+
+	def warmCorrelator(self, correlator):
+		"""Inject the common layer that every test requires into a newly started pooled correlator.
+
+		Subclasses extend this to warm the pooled correlators with their own common layer, and should
+		add any monitors that latch state to the correlator's C{resetMonitors} together with the files 
+		that re-inject them to its C{resetInjections}.
+
+		"""
+		self.injectScenarioServiceMonitors(correlator)
+
+	def getInjectedLayers(self, correlator):
+		"""Return the names of the common layers that this test has injected into a correlator.
+
+		The pool records the layers injected when a correlator is warmed, so that the tests that
+		reuse it only skip the layers that are actually there.
+
+		"""
+		layers = set()
+		if correlator in self.scenarioServiceBundleInjected: layers.add('scenarioService')
+		return layers
+
+	def adoptWarmCorrelator(self, correlator):
+		"""Record the common layers that were injected when a reused pooled correlator was warmed.
+
+		"""
+		if 'scenarioService' in correlator.warmLayers:
+			self.scenarioServiceBundleInjected[correlator] = True
+
+	def cleanup(self):
+		# Return pooled correlators before stopping the processes started by the test
+		pool = getCorrelatorPool()
+		for correlator in self.pooledCorrelators: pool.release(correlator)
+		self.pooledCorrelators = []
+		BaseTest.cleanup(self)
+		for port in self.leasedPorts: self.portAllocator.release(port)
+		self.leasedPorts = []
+		self.testDuration = time.time() - self.testStartTime
+
 	def injectDataViewMonitors(self, correlator):
 		if not correlator in self.scenarioServiceBundleInjected:
 			self.injectScenarioServiceMonitors(correlator);
@@ -185,6 +218,8 @@ class IndustrySolutionsBaseTest(BaseTest):
 		for xmlConfig in xmlConfigFiles:
 			filecopy(os.path.join(configDir, xmlConfig), os.path.join(self.OUTPUT_DIR, xmlConfig))
 			
+		if port == None:
+			port = self.allocatePort()
 		iaf = IAFHelper(self, port=port)
 		# Add any extra paths that are required
 		for currPath in pathsToAdd:
@@ -207,6 +242,68 @@ class IndustrySolutionsBaseTest(BaseTest):
 		self.log.info("Waiting for IAF to shutdown ...")
 		self.waitForSignal('iaf.log', expr='(.*)\) shutting down', timeout=10)
 		
+	def waitForSignal(self, file, filedir=None, expr="", condition=">=1", timeout=TIMEOUTS['WaitForSignal'], poll=0.25, process=None, errorExpr=[]):
+		"""Wait for a particular regular expression to be seen a set number of times in a text file.
+
+		This has the same semantics as the PySys implementation, however the file is followed 
+		incrementally by the test's log watcher rather than being read in full on every poll.
+
+		@return: The list of matches of the expression in the file
+
+		"""
+		return self.waitForSignals(file, filedir, [(expr, condition)], timeout, poll, process, errorExpr)[0]
+
+	def waitForSignals(self, file, filedir=None, signals=[], timeout=TIMEOUTS['WaitForSignal'], poll=0.25, process=None, errorExpr=[]):
+		"""Wait for several regular expressions to each be seen a set number of times in a text file.
+
+		Each entry in C{signals} is either a regular expression, which must be seen at least once, or an
+		(expression, condition) tuple, e.g. C{('Analytic .* started', '==4')}. All of the expressions are 
+		counted in a single incremental pass as the file grows, so waiting for N signals costs no more 
+		than waiting for one.
+
+		@param file: The basename of the file to wait on
+		@param filedir: The dirname of the file (defaults to the testcase output subdirectory)
+		@param signals: The list of expressions, or (expression, condition) tuples, to wait for
+		@param timeout: The timeout in seconds to wait for all of the signals
+		@param poll: The time in seconds between reads of the file
+		@param process: Optional process which, if it stops running, ends the wait
+		@param errorExpr: Optional list of expressions which, if seen in the file, end the wait
+		@return: A list of the matches of each expression, in the order the signals were given
+
+		"""
+		if filedir == None: filedir = self.output
+		f = os.path.join(filedir, file)
+		signals = [s if isinstance(s, tuple) else (s, '>=1') for s in signals]
+		exprs = [expr for expr, condition in signals] + list(errorExpr)
+
+		log.debug("Performing wait for signals in file %s:" % file)
+		for expr, condition in signals: log.debug("  expr:       %s %s" % (expr, condition))
+
+		startTime = time.time()
+		while True:
+			self.logWatcher.watch(f, exprs)
+			results = [self.logWatcher.getMatches(f, expr) for expr, condition in signals]
+			pending = [signals[i] for i in range(len(signals)) if not eval("%d %s" % (len(results[i]), signals[i][1]))]
+			if not pending:
+				log.info("Wait for signal in %s completed successfully", file)
+				break
+
+			errors = [expr for expr in errorExpr if self.logWatcher.getMatches(f, expr)]
+			if errors:
+				log.info("Wait for signal \"%s\" in %s found error expression \"%s\"", pending[0][0], file, errors[0])
+				break
+
+			if process != None and not process.running():
+				log.warn("Wait for signal \"%s\" in %s aborted as process %s is not running", pending[0][0], file, process)
+				break
+
+			if time.time() - startTime > timeout:
+				for expr, condition in pending:
+					log.warn("Wait for signal \"%s\" in %s timed out", expr, file)
+				break
+			time.sleep(poll)
+		return results
+
 	def launchAnt(self, buildFile, properties={}, targets=[], verbose=FALSE):
 		"""Run an ant task in the supplied working directory.
 
@@ -288,19 +385,53 @@ class IndustrySolutionsBaseTest(BaseTest):
 		except IOError:
 			self.addOutcome(BLOCKED)
 		else:
-			if grepResult.failureExpr == None and contains:
-				result = PASSED
-			elif grepResult.failureExpr == None and not contains:
-				result = FAILED
-			elif grepResult.failureExpr != None and not contains:
-				result = PASSED
-			else:
-				result = FAILED
-			self.outcome.append(result)
-			log.info("Ordered grep on input file %s ... %s", file, LOOKUP[result].lower())
-			if result == FAILED: log.info("Ordered grep failed on expression \"%s\"", grepResult.failureExpr)
+			self._addOrderedGrepOutcome(file, grepResult, contains)
 		return grepResult.groupValues
 
+	def assertOrderedGrepMany(self, file, filedir=None, exprLists=[], contains=True, groupValuesList=None):
+		"""Perform a validation assert on several lists of regular expressions using a single pass over a text file.
+
+		Each expression list in C{exprLists} is validated with the same semantics as L{assertOrderedGrep}, 
+		adding one outcome per list, however the file is only read once regardless of how many lists are 
+		supplied. This should be preferred over repeated calls to L{assertOrderedGrep} on large files.
+
+		@param file: The basename of the file used in the ordered grep
+		@param filedir: The dirname of the file (defaults to the testcase output subdirectory)
+		@param exprLists: A list of expression lists, each of which should occur in the file in the order they appear in the list
+		@param contains: Boolean flag to denote if the expressions should or should not be seen in the file in the order specified
+		@param groupValuesList: An optional list of group value dictionaries, one per expression list
+
+		"""
+		if filedir == None: filedir = self.output
+		f = os.path.join(filedir, file)
+
+		log.debug("Performing ordered grep of %d expression lists on file:" % len(exprLists))
+		log.debug("  file:       %s" % file)
+		log.debug("  filedir:    %s" % filedir)
+		log.debug("  contains:   %s" % LOOKUP[contains])
+
+		try:
+			grepResults = orderedgrepMany(f, exprLists, groupValuesList)
+		except IOError:
+			self.addOutcome(BLOCKED)
+			return []
+		for grepResult in grepResults:
+			self._addOrderedGrepOutcome(file, grepResult, contains)
+		return [r.groupValues for r in grepResults]
+
+	def _addOrderedGrepOutcome(self, file, grepResult, contains):
+		if grepResult.failureExpr == None and contains:
+			result = PASSED
+		elif grepResult.failureExpr == None and not contains:
+			result = FAILED
+		elif grepResult.failureExpr != None and not contains:
+			result = PASSED
+		else:
+			result = FAILED
+		self.outcome.append(result)
+		log.info("Ordered grep on input file %s ... %s", file, LOOKUP[result].lower())
+		if result == FAILED: log.info("Ordered grep failed on expression \"%s\"", grepResult.failureExpr)
+
 	def checkNoCrash(self, correlatorLog="correlator.out"):
 		self.assertGrep(file=correlatorLog, expr='ERROR.*Error on line', contains=0)
 		self.assertGrep(file=correlatorLog, expr='ERROR.*Stack dump', contains=0)
@@ -0,0 +1,141 @@
+import re, os, json, math
+
+# Default regression thresholds, as the fraction by which a metric may be worse than the baseline
+DEFAULT_THRESHOLDS = {'eventsPerSecond':  0.10,
+                      'latencyP50':       0.25,
+                      'latencyP99':       0.25,
+                      'peakResidentKB':   0.20}
+
+# Whether a larger value of each metric is better or worse
+HIGHER_IS_BETTER = {'eventsPerSecond':  True,
+                    'latencyP50':       False,
+                    'latencyP99':       False,
+                    'peakResidentKB':   False}
+
+EVENT_RATE_EXPR = re.compile(r'com\.industry\.analytics\.Data\("[^"]*","[^"]*","[^"]*",([^,]+),([^,]+),')
+STATUS_EXPR     = re.compile(r'Correlator Status: (.*)$')
+STATUS_ITEM     = re.compile(r'(\w+)=("[^"]*"|\S+)')
+
+
+def percentile(values, p):
+    """Return the p'th percentile (0-100) of a list of values, using linear interpolation between ranks.
+
+    """
+    if not values: return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100.0
+    lower = int(math.floor(rank))
+    upper = int(math.ceil(rank))
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def parseEventRates(file, discard=1):
+    """Parse the event rates from the Data events generated by an EventRate analytic.
+
+    Zero rates (periods where the input had already stopped) are ignored, as are the first
+    C{discard} non-zero rates, which cover the warm-up and a partial measurement period.
+
+    @param file: The full path to the file the EventRate output was received into
+    @param discard: The number of leading rates to ignore
+    @returns: The list of event rates, in events per second
+
+    """
+    rates = []
+    f = open(file, 'r')
+    try:
+        for line in f:
+            matched = EVENT_RATE_EXPR.search(line)
+            if matched == None: continue
+            rate = float(matched.group(2))
+            if rate > 0: rates.append(rate)
+    finally:
+        f.close()
+    return rates[discard:]
+
+
+def parseCorrelatorStatus(file):
+    """Parse the periodic status lines logged by a correlator.
+
+    @param file: The full path to the correlator log file
+    @returns: A list of dictionaries of status item name to value, one per status line
+
+    """
+    statuses = []
+    f = open(file, 'r')
+    try:
+        for line in f:
+            matched = STATUS_EXPR.search(line)
+            if matched == None: continue
+            status = {}
+            for name, value in STATUS_ITEM.findall(matched.group(1)):
+                try:
+                    status[name] = float(value)
+                except ValueError:
+                    status[name] = value.strip('"')
+            statuses.append(status)
+    finally:
+        f.close()
+    return statuses
+
+
+def measure(eventRateFile, correlatorLog, discard=1):
+    """Produce the benchmark results for a run from its EventRate output and correlator log.
+
+    Latency is taken from the time the slowest context is behind (the C{lct} status item), and
+    memory from the physical memory of the correlator (the C{pm} status item).
+
+    @returns: A dictionary of metric name to value
+
+    """
+    rates = parseEventRates(eventRateFile, discard)
+    statuses = parseCorrelatorStatus(correlatorLog)
+    latencies = [s['lct'] for s in statuses if isinstance(s.get('lct'), float)]
+    memory = [s['pm'] for s in statuses if isinstance(s.get('pm'), float)]
+
+    results = {}
+    results['eventRateSamples'] = len(rates)
+    results['eventsPerSecond']  = sum(rates) / len(rates) if rates else None
+    results['eventsPerSecondP50'] = percentile(rates, 50)
+    results['latencyP50']       = percentile(latencies, 50)
+    results['latencyP99']       = percentile(latencies, 99)
+    results['peakResidentKB']   = max(memory) if memory else None
+    return results
+
+
+def compare(results, baseline, thresholds=None):
+    """Compare benchmark results against a baseline.
+
+    @param results: The results of the current run
+    @param baseline: The baseline results
+    @param thresholds: Optional overrides of the regression thresholds in DEFAULT_THRESHOLDS
+    @returns: A list of (metric, value, baseline value, change) tuples for every metric that regressed
+
+    """
+    limits = dict(DEFAULT_THRESHOLDS)
+    if thresholds: limits.update(thresholds)
+
+    regressions = []
+    for metric, limit in limits.items():
+        value = results.get(metric)
+        expected = baseline.get(metric)
+        if value == None or expected == None or expected == 0: continue
+        change = (value - expected) / float(expected)
+        if HIGHER_IS_BETTER[metric]: change = -change
+        if change > limit: regressions.append((metric, value, expected, change))
+    return regressions
+
+
+def load(file):
+    f = open(file, 'r')
+    try:
+        return json.load(f)
+    finally:
+        f.close()
+
+
+def save(file, results):
+    f = open(file, 'w')
+    try:
+        json.dump(results, f, indent=2, sort_keys=True)
+    finally:
+        f.close()
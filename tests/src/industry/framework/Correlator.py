@@ -1,7 +1,8 @@
+from __future__ import with_statement
 from apama.correlator import CorrelatorHelper
 from apama.common import XArgsHolder
 from pysys.constants import TRUE,FALSE,FOREGROUND,BACKGROUND,PROJECT,PLATFORM
-import os, types
+import os, types, itertools
 
 class IndustrySolutionsCorrelatorHelper(CorrelatorHelper):
 
@@ -13,6 +14,7 @@ class IndustrySolutionsCorrelatorHelper(CorrelatorHelper):
 
 		self.eventSender = None
 		self.time = 0.0
+		self.pooled = False
         
 	def start(self, logfile=None, verbosity=None, java=None, Xclock=TRUE, 
 			  applicationEventLogging=FALSE, startTime=0.0, 
@@ -111,14 +113,112 @@ class IndustrySolutionsCorrelatorHelper(CorrelatorHelper):
 		if log:
 			self.log.info('Sent literal: %s' % (string))
 
-	def incrementTime(self, inc, silent=False):
-		self.time = self.time + inc
-		if not silent: self.parent.log.info('time is set to: %s' % self.time)
-		self.sendLiteral("&TIME(%f)" % self.time)
+	def sendLiterals(self, literals, log=True, batchSize=10000):
+		"""Send a sequence of literals to the correlator, writing them in batches rather than one at a time.
+
+		The literals may be any iterable, including a generator, so arbitrarily long event streams can 
+		be sent without being held in memory. Any C{&TIME} or C{&SETTIME} literals are tracked so that the 
+		cached time stays correct.
+
+		@param literals: An iterable of event or time literals
+		@param log: If true, log a summary line for each batch written; if false, nothing is logged
+		@param batchSize: The maximum number of literals to write in one batch
+		@returns: The number of literals sent
+
+		"""
+		if self.eventSender == None:
+			self.eventSender = self.send(state=BACKGROUND)
+		count = 0
+		iterator = iter(literals)
+		while True:
+			batch = list(itertools.islice(iterator, batchSize))
+			if not batch: break
+			for literal in reversed(batch):
+				if literal.startswith('&TIME(') or literal.startswith('&SETTIME('):
+					self.time = float(literal[literal.index('(')+1:literal.rindex(')')])
+					break
+			batch.append("BATCH 000")
+			self.eventSender.write("\n".join(batch))
+			count += len(batch) - 1
+			if log:
+				self.log.info('Sent %d literals, time is: %s' % (len(batch) - 1, self.time))
+		return count
+
+	def batch(self, log=True, batchSize=10000):
+		"""Return a L{LiteralBatch} that buffers literals and time increments, sending them to this correlator in batches.
+		
+		"""
+		return LiteralBatch(self, log, batchSize)
+
+	def incrementTime(self, inc, silent=False, count=1):
+		"""Increment the correlator time, optionally by several ticks that are sent in a single write.
+
+		@param inc: The amount to increment the time by on each tick
+		@param silent: If true, do not log the new time
+		@param count: The number of ticks to send
+
+		"""
+		if count == 1:
+			self.time = self.time + inc
+			if not silent: self.parent.log.info('time is set to: %s' % self.time)
+			self.sendLiteral("&TIME(%f)" % self.time)
+		else:
+			start = self.time
+			self.sendLiterals(("&TIME(%f)" % (start + inc * i) for i in xrange(1, count + 1)), log=False)
+			if not silent: self.parent.log.info('time is set to: %s' % self.time)
 
 	def setTime(self, time):
 		self.time = time
 		self.sendLiteral("&TIME(%f)" % self.time)
+
+	def resetTime(self, time):
+		"""Set the correlator clock to the given time, even if it is earlier than the current time.
+		
+		"""
+		self.time = time
+		self.sendLiteral("&SETTIME(%f)" % self.time)
 		
 	def getTime(self):
 		return self.time
+
+
+class LiteralBatch:
+	"""Buffers event literals and time increments, sending them to a correlator in batches.
+
+	Can be used as a context manager, in which case anything still buffered is sent on exit ::
+
+		with correlator.batch(log=False) as batch:
+			for i in range(100000):
+				batch.add('com.industry.analytics.Data("Input","r","A",%d,%d,"",0,0,0,{})' % (i, i))
+				batch.incrementTime(1.0)
+
+	"""
+	def __init__(self, correlator, log=True, batchSize=10000):
+		self.correlator = correlator
+		self.log = log
+		self.batchSize = batchSize
+		self.time = correlator.time
+		self.literals = []
+
+	def add(self, literal):
+		self.literals.append(literal)
+		if len(self.literals) >= self.batchSize: self.flush()
+
+	def incrementTime(self, inc):
+		self.setTime(self.time + inc)
+
+	def setTime(self, time):
+		self.time = time
+		self.add("&TIME(%f)" % time)
+
+	def flush(self):
+		if self.literals:
+			literals, self.literals = self.literals, []
+			self.correlator.sendLiterals(literals, self.log, self.batchSize)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, type, value, traceback):
+		self.flush()
+		return False
@@ -0,0 +1,232 @@
+from __future__ import with_statement
+from pysys.constants import *
+from pysys.process.user import ProcessUser
+from pysys import log
+from industry.framework.Correlator import IndustrySolutionsCorrelatorHelper
+import os, threading
+
+# Sections of the engine_inspect output that list the names of injected objects
+INSPECT_SECTIONS = ['Monitors', 'Event Types']
+
+
+def parseInspect(file):
+	"""Parse the output of engine_inspect, returning a dictionary of section title to the set of names listed in it.
+
+	Only the sections listed in INSPECT_SECTIONS are returned.
+
+	"""
+	sections = {}
+	for title in INSPECT_SECTIONS: sections[title] = set()
+	lines = [l.rstrip() for l in open(file, 'r').readlines()]
+	current = None
+	for i in range(len(lines)):
+		line = lines[i]
+		if i + 1 < len(lines) and lines[i+1].startswith('===='):
+			current = sections.get(line.strip())
+			continue
+		if current == None or line == '' or line.startswith('====') or line.startswith('----') or line.startswith('Name '):
+			continue
+		current.add(line.split()[0])
+	return sections
+
+
+class CorrelatorPoolOwner(ProcessUser):
+	"""Owner of the processes started by the correlator pool.
+
+	Pooled correlators must outlive the test that first leased them, so they are started by this
+	owner rather than by the test, and are not stopped when a test is cleaned up.
+
+	"""
+	def __init__(self, output, environ):
+		ProcessUser.__init__(self)
+		self.output = output
+		self.environ = environ
+		self.log = log
+		if not os.path.exists(self.output): os.makedirs(self.output)
+
+
+class CorrelatorPool:
+	"""A pool of pre-warmed correlators that are reused across tests.
+
+	A correlator is started and warmed (has the common layer injected) the first time a test leases
+	it. The set of monitors and event types present once it is warm is recorded as its baseline. When
+	the test completes the correlator is returned to the pool and reset with a deterministic sequence:
+
+	  1. All caches and data views are cleared (C{ClearCache("")} and C{ClearDataView("")})
+	  2. All monitors and event types that are not in the baseline are deleted
+	  3. Monitors in the warm layer that latch state are deleted and their files re-injected
+	  4. The correlator clock is reset with C{&SETTIME}
+
+	Any correlator that fails to reset is stopped and discarded rather than returned to the pool, as is
+	any correlator whose state cannot be reset (C{reusable} set to false by the test), such as one
+	that has had stores opened in it by the MemoryStore Analytic, which outlive the monitors using them.
+
+	"""
+	def __init__(self, size, output, portAllocator):
+		self.size = size
+		self.output = output
+		self.portAllocator = portAllocator
+		self.lock = threading.Lock()
+		self.owner = None
+		self.idle = []
+		self.count = 0
+
+	def _getOwner(self, test):
+		with self.lock:
+			if self.owner == None:
+				self.owner = CorrelatorPoolOwner(self.output, dict(test.environ))
+			return self.owner
+
+	def lease(self, test, logfile, verbosity, startTime):
+		"""Lease a warm correlator for the given test, returning None if the pool is exhausted.
+
+		@param test: The test leasing the correlator
+		@param logfile: The name of the log file, in the test output directory, to write application logging to
+		@param verbosity: The application log level to use
+		@param startTime: The time to set the correlator clock to
+
+		"""
+		correlator = None
+		with self.lock:
+			if self.idle:
+				correlator = self.idle.pop()
+			elif self.count < self.size:
+				self.count += 1
+			else:
+				return None
+
+		if correlator == None:
+			correlator = self._create(test)
+			if correlator == None: return None
+			self._bind(correlator, test, logfile, verbosity)
+			test.warmCorrelator(correlator)
+			correlator.warmLayers = test.getInjectedLayers(correlator)
+			self._snapshot(correlator)
+		else:
+			self._bind(correlator, test, logfile, verbosity)
+			test.adoptWarmCorrelator(correlator)
+
+		correlator.reusable = True
+		correlator.resetTime(startTime)
+		return correlator
+
+	def release(self, correlator):
+		"""Return a correlator to the pool, resetting it for use by the next test.
+
+		"""
+		self._bind(correlator, self.owner, None, None)
+		if not correlator.reusable:
+			self._discard(correlator)
+			return
+		try:
+			reset = self._reset(correlator)
+		except Exception, e:
+			log.warn("Failed to reset pooled correlator on port %d: %s", correlator.port, e)
+			reset = False
+
+		if reset:
+			with self.lock: self.idle.append(correlator)
+		else:
+			self._discard(correlator)
+
+	def shutdown(self):
+		"""Stop all idle correlators in the pool.
+
+		"""
+		with self.lock:
+			idle, self.idle = self.idle, []
+		for correlator in idle: self._discard(correlator)
+
+	def _create(self, test):
+		owner = self._getOwner(test)
+		port = self.portAllocator.allocate(owner='correlator-pool')
+		correlator = IndustrySolutionsCorrelatorHelper(owner, port=port)
+		try:
+			correlator.start(logfile='pooled-correlator-%d.log' % port, Xclock=TRUE)
+		except Exception, e:
+			log.warn("Failed to start pooled correlator on port %d: %s", port, e)
+			self.portAllocator.release(port)
+			with self.lock: self.count -= 1
+			return None
+		correlator.pooled = True
+		correlator.warmLayers = set()
+		correlator.resetMonitors = []
+		correlator.resetInjections = []
+		return correlator
+
+	def _discard(self, correlator):
+		try:
+			correlator.stop()
+		except Exception, e:
+			log.warn("Failed to stop pooled correlator on port %d: %s", correlator.port, e)
+		self.portAllocator.release(correlator.port)
+		with self.lock: self.count -= 1
+
+	def _bind(self, correlator, parent, logfile, verbosity):
+		"""Bind a pooled correlator to a new parent, so that any processes started to interact with it
+		(injections, sends and so on) are owned by and write to the output directory of that parent.
+
+		"""
+		correlator.parent = parent
+		correlator.log = parent.log
+		correlator.environ = parent.environ
+		if logfile != None:
+			correlator.logFile = logfile
+			correlator.manage(arguments=['-r', 'setApplicationLogFile %s' % os.path.join(parent.output, logfile)])
+		if verbosity != None:
+			correlator.manage(arguments=['-r', 'setApplicationLogLevel %s' % verbosity])
+
+	def _inspect(self, correlator):
+		filename = 'inspect-%d.txt' % correlator.port
+		correlator.inspect(filename=filename)
+		return parseInspect(os.path.join(correlator.parent.output, filename))
+
+	def _snapshot(self, correlator):
+		correlator.baseline = self._inspect(correlator)
+
+	def _reset(self, correlator):
+		correlator.sendLiteral('com.industry.analytics.ClearCache("")', log=False)
+		correlator.sendLiteral('com.industry.analytics.ClearDataView("")', log=False)
+
+		current = self._inspect(correlator)
+		monitors = sorted(current['Monitors'] - correlator.baseline['Monitors'])
+		monitors.extend(correlator.resetMonitors)
+		if monitors:
+			correlator.delete(names=monitors, force=TRUE)
+
+		# Nested event types are removed along with the monitor that declares them
+		eventTypes = sorted([e for e in current['Event Types'] - correlator.baseline['Event Types']
+							 if not e.rsplit('.', 1)[0] in current['Monitors']])
+		if eventTypes:
+			correlator.delete(names=eventTypes, force=TRUE)
+
+		for filenames, filedir in correlator.resetInjections:
+			correlator.injectMonitorscript(filenames, filedir)
+
+		# Check that the correlator is back to its baseline before reusing it
+		after = self._inspect(correlator)
+		for title in INSPECT_SECTIONS:
+			if after[title] != correlator.baseline[title]:
+				return False
+		correlator.resetTime(0.0)
+		return True
+
+
+_pool = None
+
+def configure(size, output, portAllocator):
+	"""Create the process-wide correlator pool, or disable pooling if the size is zero.
+
+	"""
+	global _pool
+	if size > 0:
+		_pool = CorrelatorPool(size, output, portAllocator)
+	else:
+		_pool = None
+	return _pool
+
+def getCorrelatorPool():
+	"""Return the process-wide correlator pool, or None if pooled mode is not enabled.
+
+	"""
+	return _pool
@@ -0,0 +1,181 @@
+import math
+from itertools import izip_longest
+
+from industry.framework.GrepUtils import READ_BUFFER_SIZE, _compile
+
+DATA_PREFIX = 'com.industry.analytics.Data('
+
+# The fields of the Data event, and the indexes of those compared numerically within a tolerance
+DATA_FIELDS = ['streamName', 'type', 'sourceId', 'timestamp', 'dValue', 'sValue', 'xValue', 'yValue', 'zValue', 'params']
+TOLERANT_FIELDS = [4, 6, 7, 8]
+TIMESTAMP_FIELD = 3
+
+
+def _splitFields(body):
+    """Split the body of an event literal on its top level commas, respecting strings, sequences and dictionaries.
+
+    """
+    fields = []
+    depth = 0
+    inString = False
+    start = 0
+    i = 0
+    while i < len(body):
+        c = body[i]
+        if inString:
+            if c == '\\': i += 1
+            elif c == '"': inString = False
+        elif c == '"': inString = True
+        elif c in '[{(': depth += 1
+        elif c in ']})': depth -= 1
+        elif c == ',' and depth == 0:
+            fields.append(body[start:i].strip())
+            start = i + 1
+        i += 1
+    fields.append(body[start:].strip())
+    return fields
+
+
+def parseData(line):
+    """Parse a com.industry.analytics.Data event literal, optionally prefixed by its channel.
+
+    @returns: A tuple of the channel (or None) and the list of field strings, or None if the line is not a Data event
+
+    """
+    index = line.find(DATA_PREFIX)
+    if index < 0 or not line.endswith(')'): return None
+    channel = line[:index].rstrip(',').strip() or None
+    fields = _splitFields(line[index + len(DATA_PREFIX):-1])
+    if len(fields) != len(DATA_FIELDS): return None
+    return channel, fields
+
+
+def _toFloat(value):
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def valuesMatch(value1, value2, relTolerance=0.0, absTolerance=0.0):
+    """Return true if two numeric field strings are equal within the given relative or absolute tolerance.
+
+    """
+    if value1 == value2: return True
+    a = _toFloat(value1)
+    b = _toFloat(value2)
+    if a == None or b == None: return False
+    if math.isnan(a) or math.isnan(b): return math.isnan(a) and math.isnan(b)
+    if math.isinf(a) or math.isinf(b): return a == b
+    return abs(a - b) <= max(absTolerance, relTolerance * max(abs(a), abs(b)))
+
+
+def linesMatch(line1, line2, relTolerance=0.0, absTolerance=0.0):
+    """Return true if two lines are identical, or are Data events whose values are equal within the tolerance.
+
+    Only the dValue, xValue, yValue and zValue fields are compared within the tolerance. The timestamp
+    must be numerically equal, and all other fields must be identical.
+
+    """
+    if line1 == line2: return True
+    if line1 == None or line2 == None: return False
+    if relTolerance <= 0 and absTolerance <= 0: return False
+    data1 = parseData(line1)
+    if data1 == None: return False
+    data2 = parseData(line2)
+    if data2 == None or data1[0] != data2[0]: return False
+
+    fields1, fields2 = data1[1], data2[1]
+    for i in range(len(DATA_FIELDS)):
+        if fields1[i] == fields2[i]: continue
+        if i in TOLERANT_FIELDS:
+            if not valuesMatch(fields1[i], fields2[i], relTolerance, absTolerance): return False
+        elif i == TIMESTAMP_FIELD:
+            if not valuesMatch(fields1[i], fields2[i]): return False
+        else:
+            return False
+    return True
+
+
+def _selectLines(file, ignores=[], includes=[], replace=[]):
+    """Stream the stripped lines of a file, applying the same ignores, includes and replacements as the PySys file diff.
+
+    """
+    ignoreExprs = [_compile(e) for e in ignores]
+    includeExprs = [_compile(e) for e in includes]
+    replacements = [(_compile(e), r) for e, r in replace]
+    f = open(file, 'r', READ_BUFFER_SIZE)
+    try:
+        for line in f:
+            line = line.strip()
+            if [e for e in ignoreExprs if e.search(line) != None]: continue
+            if includeExprs and not any(e.search(line) for e in includeExprs): continue
+            for expr, replacement in replacements: line = expr.sub(replacement, line)
+            yield line
+    finally:
+        f.close()
+
+
+class DiffResult:
+    """The result of a tolerant diff: the total number of differing lines, and the first of them.
+
+    @ivar differences: A list of (line number, line of file1, line of file2) tuples, of at most the window size
+    @ivar count: The total number of differing lines
+
+    """
+    def __init__(self):
+        self.differences = []
+        self.count = 0
+
+    def passed(self):
+        return self.count == 0
+
+
+def tolerantDiff(file1, file2, ignores=[], sort=False, replace=[], includes=[],
+                 relTolerance=0.0, absTolerance=0.0, window=20):
+    """Compare two files line by line, allowing Data event values to differ within a tolerance.
+
+    Both files are streamed (unless C{sort} is set, which requires them to be read in full), and only the
+    first C{window} differing lines are kept.
+
+    @param file1: The full path to the first file
+    @param file2: The full path to the second file
+    @param ignores: Regular expressions of lines to ignore
+    @param sort: Whether to sort the lines of both files before comparing them
+    @param replace: A list of (regular expression, replacement) tuples applied to each line
+    @param includes: Regular expressions of lines to compare; if given, a line must match at least one of them
+    @param relTolerance: The relative tolerance of the Data event values
+    @param absTolerance: The absolute tolerance of the Data event values
+    @param window: The maximum number of differing lines to keep
+    @returns: A L{DiffResult}
+
+    """
+    lines1 = _selectLines(file1, ignores, includes, replace)
+    lines2 = _selectLines(file2, ignores, includes, replace)
+    if sort:
+        lines1 = sorted(lines1)
+        lines2 = sorted(lines2)
+
+    result = DiffResult()
+    lineNumber = 0
+    for line1, line2 in izip_longest(lines1, lines2):
+        lineNumber += 1
+        if linesMatch(line1, line2, relTolerance, absTolerance): continue
+        result.count += 1
+        if len(result.differences) < window: result.differences.append((lineNumber, line1, line2))
+    return result
+
+
+def writeDifferences(filename, result):
+    """Write the differing lines kept in a diff result to a file.
+
+    """
+    f = open(filename, 'w')
+    try:
+        f.write('%d differing lines, showing the first %d\n' % (result.count, len(result.differences)))
+        for lineNumber, line1, line2 in result.differences:
+            f.write('\nline %d\n' % lineNumber)
+            f.write('- %s\n' % (line1 if line1 != None else '<missing>'))
+            f.write('+ %s\n' % (line2 if line2 != None else '<missing>'))
+    finally:
+        f.close()
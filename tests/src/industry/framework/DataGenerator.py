@@ -0,0 +1,182 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Value shapes supported by the generator
+SHAPES = ['sine', 'randomWalk', 'random', 'constant']
+
+
+class DataGenerator:
+    """Vectorised generator of synthetic com.industry.analytics.Data events.
+
+    Events are generated in chunks using NumPy, so large performance inputs can be written to file,
+    or streamed into a correlator, without depending on the scheduling of a simulator running in a
+    correlator. The output is fully determined by the seed, so the same load can be reproduced
+    exactly from run to run.
+
+    Events are produced for each source in turn (round robin), evenly spaced in time at the given
+    overall rate. The value of each event is drawn from the configured shape, and spikes and gaps
+    can optionally be overlaid on top of it. For example ::
+
+        gen = DataGenerator('Input', sourceIdCount=1000, shape='sine', rate=50000.0, seed=1, timeTick=1.0)
+        gen.write(os.path.join(self.output, 'Input.evt'), 100000000)
+        correlator.sendLiterals(DataGenerator('Input', shape='randomWalk', seed=2).generate(1000000), log=False)
+
+    @param streamName: The streamName of the generated Data events
+    @param sourceIdCount: The number of distinct sourceIds (the cardinality)
+    @param sourceIdPrefix: The prefix of each generated sourceId, which is followed by its index
+    @param shape: The shape of the generated values, one of SHAPES
+    @param lower: The lower bound of the values (the trough of a sine wave, or the random range)
+    @param upper: The upper bound of the values (the peak of a sine wave, or the random range)
+    @param period: The period in seconds of a sine wave
+    @param step: The standard deviation of each step of a random walk
+    @param spikeProbability: The probability of any event being a spike
+    @param spikeSize: The amount added to (or subtracted from) the value of a spike
+    @param gapProbability: The probability of any event being dropped
+    @param rate: The overall number of events per second, across all sources
+    @param startTime: The timestamp of the first event
+    @param timeTick: If greater than zero, a &TIME literal is interleaved each time the event timestamps
+                     cross a multiple of this period
+    @param seed: The seed of the random number generator
+    @param dataType: The type field of the generated Data events
+
+    """
+    def __init__(self, streamName, sourceIdCount=1, sourceIdPrefix='', shape='sine',
+                 lower=0.0, upper=100.0, period=60.0, step=1.0,
+                 spikeProbability=0.0, spikeSize=50.0, gapProbability=0.0,
+                 rate=1000.0, startTime=0.0, timeTick=0.0, seed=0, dataType='r'):
+        if numpy == None:
+            raise Exception("NumPy is required to generate synthetic Data events")
+        if not shape in SHAPES:
+            raise Exception("Unknown shape %s, should be one of %s" % (shape, SHAPES))
+
+        self.streamName = streamName
+        self.sourceIdCount = sourceIdCount
+        self.sourceIds = numpy.array(['%s%d' % (sourceIdPrefix, i) for i in range(sourceIdCount)])
+        self.shape = shape
+        self.lower = lower
+        self.upper = upper
+        self.period = period
+        self.step = step
+        self.spikeProbability = spikeProbability
+        self.spikeSize = spikeSize
+        self.gapProbability = gapProbability
+        self.interval = 1.0 / rate
+        self.startTime = startTime
+        self.timeTick = timeTick
+        self.dataType = dataType
+        self.random = numpy.random.RandomState(seed)
+
+        # Per-source state carried between chunks
+        self.phases = self.random.uniform(0.0, 2 * numpy.pi, sourceIdCount)
+        self.walk = self.random.uniform(lower, upper, sourceIdCount)
+        self.index = 0
+        self.lastTick = None
+
+    def _values(self, timestamps, sources):
+        n = len(timestamps)
+        if self.shape == 'sine':
+            mid = (self.upper + self.lower) / 2.0
+            amplitude = (self.upper - self.lower) / 2.0
+            values = mid + amplitude * numpy.sin(2 * numpy.pi * timestamps / self.period + self.phases[sources])
+        elif self.shape == 'randomWalk':
+            steps = self.random.normal(0.0, self.step, n)
+            values = numpy.empty(n)
+            # Accumulate the steps of each source separately, carrying the position of each source forward
+            for offset in range(min(self.sourceIdCount, n)):
+                mask = slice(offset, n, self.sourceIdCount)
+                source = sources[offset]
+                walk = self.walk[source] + numpy.cumsum(steps[mask])
+                values[mask] = walk
+                self.walk[source] = walk[-1]
+        elif self.shape == 'random':
+            values = self.random.uniform(self.lower, self.upper, n)
+        else:
+            values = numpy.empty(n)
+            values.fill(self.lower)
+
+        if self.spikeProbability > 0:
+            spikes = self.random.random_sample(n) < self.spikeProbability
+            signs = numpy.where(self.random.random_sample(n) < 0.5, -1.0, 1.0)
+            values = values + spikes * signs * self.spikeSize
+        return values
+
+    def generateChunk(self, count):
+        """Generate the next chunk of events, returning them as a list of literals.
+
+        @param count: The number of events to generate before any gaps are removed
+
+        """
+        indices = numpy.arange(self.index, self.index + count)
+        self.index += count
+        timestamps = self.startTime + indices * self.interval
+        sources = indices % self.sourceIdCount
+        values = self._values(timestamps, sources)
+
+        if self.gapProbability > 0:
+            keep = self.random.random_sample(count) >= self.gapProbability
+            timestamps, sources, values = timestamps[keep], sources[keep], values[keep]
+
+        prefix = 'com.industry.analytics.Data("%s","%s","' % (self.streamName, self.dataType)
+        lines = numpy.char.add(prefix, self.sourceIds[sources])
+        lines = numpy.char.add(lines, '",')
+        lines = numpy.char.add(lines, numpy.char.mod('%.6f', timestamps))
+        lines = numpy.char.add(lines, ',')
+        lines = numpy.char.add(lines, numpy.char.mod('%.6f', values))
+        lines = numpy.char.add(lines, ',"",0.0,0.0,0.0,{})')
+        lines = lines.tolist()
+
+        if self.timeTick > 0 and len(timestamps):
+            ticks = numpy.floor(timestamps / self.timeTick).astype(numpy.int64)
+            if self.lastTick == None: self.lastTick = ticks[0] - 1
+            # Emit a &TIME before the first event of each new tick, copying the events between ticks in slices
+            boundaries = numpy.nonzero(numpy.diff(numpy.concatenate(([self.lastTick], ticks))))[0]
+            if len(boundaries):
+                merged = []
+                start = 0
+                for position in boundaries:
+                    merged.extend(lines[start:position])
+                    merged.append('&TIME(%f)' % (ticks[position] * self.timeTick))
+                    start = position
+                merged.extend(lines[start:])
+                lines = merged
+            self.lastTick = ticks[-1]
+        return lines
+
+    def generate(self, count, chunkSize=100000):
+        """Generate events as a stream of literals, suitable for IndustrySolutionsCorrelatorHelper.sendLiterals.
+
+        @param count: The total number of events to generate before any gaps are removed
+        @param chunkSize: The number of events to generate at a time
+
+        """
+        remaining = count
+        while remaining > 0:
+            chunk = min(chunkSize, remaining)
+            remaining -= chunk
+            for line in self.generateChunk(chunk):
+                yield line
+
+    def write(self, filename, count, chunkSize=1000000, channel=None):
+        """Write events to an event file.
+
+        @param filename: The full path to the event file
+        @param count: The total number of events to generate before any gaps are removed
+        @param chunkSize: The number of events to generate and write at a time
+        @param channel: Optional channel to prefix each event with
+
+        """
+        f = open(filename, 'w', 4 * 1024 * 1024)
+        try:
+            remaining = count
+            while remaining > 0:
+                chunk = min(chunkSize, remaining)
+                remaining -= chunk
+                lines = self.generateChunk(chunk)
+                if channel != None:
+                    lines = ['"%s",%s' % (channel, l) if not l.startswith('&') else l for l in lines]
+                f.write('\n'.join(lines))
+                f.write('\n')
+        finally:
+            f.close()
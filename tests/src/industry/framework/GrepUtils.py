@@ -2,11 +2,101 @@ import re, os
 from pysys import log
 from pysys.exceptions import FileNotFoundException
 
+# Size of the read buffer used when streaming through an input file
+READ_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Maximum number of compiled regular expressions that are cached
+MAX_CACHED_EXPRS = 512
+
+# Cache of compiled regular expressions, keyed by the uncompiled expression
+_compiledExprs = {}
+
+def _compile(expr):
+    """Return the compiled form of a regular expression, caching it for reuse.
+
+    The cache is cleared once it holds L{MAX_CACHED_EXPRS} expressions, so it does not grow without bound.
+
+    """
+    compiled = _compiledExprs.get(expr)
+    if compiled == None:
+        if len(_compiledExprs) >= MAX_CACHED_EXPRS:
+            _compiledExprs.clear()
+        compiled = re.compile(expr)
+        _compiledExprs[expr] = compiled
+    return compiled
+
+
 class OrderedGrepResults:
-    def init(self):
+    def __init__(self):
         self.failureExpr = None
         self.groupValues = {}
 
+
+class OrderedGrepMatcher:
+    """Incremental matcher for a single ordered list of regular expressions.
+
+    Lines are fed to the matcher one at a time, and only the expression currently
+    waiting to be matched is tested against each line. The matcher holds no file
+    contents, so the memory used is independent of the size of the input file.
+
+    """
+    def __init__(self, exprList, groupValues = None):
+        self.exprs = map(lambda x:(_compile(x), x), exprList)
+        self.index = 0
+        self.result = OrderedGrepResults()
+        if groupValues != None:
+            self.result.groupValues = groupValues
+        if len(self.exprs) > 0:
+            self.result.failureExpr = self.exprs[0][1]
+        self.done = len(self.exprs) == 0
+
+    def feed(self, line):
+        """Test a single line against the current expression, returning true once no more lines are required.
+
+        @param line: The line read from the input file
+        @returns: done (True / False)
+
+        """
+        matched = self.exprs[self.index][0].search(line)
+        if matched != None:
+            #check all groups match
+            groupValues = self.result.groupValues
+            for group in matched.groupdict():
+                if groupValues.has_key(group):
+                    if matched.group(group) != groupValues[group]:
+                        log.error("Value of group (%s) has value \"%s\" should be \"%s\""%(group,matched.group(group),groupValues[group]))
+                        self.done = True
+                        return True
+                else:
+                    groupValues[group] = matched.group(group)
+            self.index += 1
+            if self.index == len(self.exprs):
+                self.result.failureExpr = None
+                self.done = True
+            else:
+                self.result.failureExpr = self.exprs[self.index][1]
+        return self.done
+
+
+def _streamMatchers(file, matchers):
+    """Stream the lines of an input file through a list of matchers in a single pass.
+
+    Reading stops as soon as every matcher has completed.
+
+    """
+    if not os.path.exists(file):
+        raise FileNotFoundException, "unable to find file %s" % (os.path.basename(file))
+    active = [m for m in matchers if not m.done]
+    if not active: return
+    f = open(file, 'r', READ_BUFFER_SIZE)
+    try:
+        for line in f:
+            active = [m for m in active if not m.feed(line)]
+            if not active: break
+    finally:
+        f.close()
+
+
 def orderedgrep(file, exprList, groupValues = None):
     """Seach for ordered matches to a set of regular expressions in an input file, returning true if the matches occur in the correct order.
     
@@ -23,6 +113,9 @@ def orderedgrep(file, exprList, groupValues = None):
     an expression list of ["^A.*$", "^C.*$", "^D.*$"] will return true, whilst an expression list of 
     ["^A.*$", "^C.$", "^B.$"] will return false.
     
+    The input file is streamed rather than read into memory, and reading stops as soon as the last
+    expression in the list has been matched.
+    
     @param file: The full path to the input file
     @param exprList: A list of regular expressions (uncompiled) to search for in the input file
     @returns: success (True / False)
@@ -30,36 +123,29 @@ def orderedgrep(file, exprList, groupValues = None):
     @raises FileNotFoundException: Raised if the input file does not exist
         
     """
-    list = map(lambda x:(re.compile(x), x),exprList)
-    list.reverse();
-    result = OrderedGrepResults()
-    item = list.pop()
-    result.failureExpr = item[1]
-    
-    result.groupValues = groupValues
-    if groupValues == None:
-        result.groupValues = {}
-    
+    matcher = OrderedGrepMatcher(exprList, groupValues)
+    _streamMatchers(file, [matcher])
+    return matcher.result
 
-    if not os.path.exists(file):
-        raise FileNotFoundException, "unable to find file %s" % (os.path.basename(file))
-    else:
-        contents = open(file, 'r').readlines()      
-        for i in range(len(contents)):
-            matched = item[0].search(r"%s"%contents[i])
-            if matched != None:
-                #check all groups match
-                for group in matched.groupdict():
-                    if result.groupValues.has_key(group):
-                        if matched.group(group) != result.groupValues[group]:
-                            log.error("Value of group (%s) has value \"%s\" should be \"%s\""%(group,matched.group(group),result.groupValues[group]))
-                            return result
-                    else:
-                        result.groupValues[group] = matched.group(group)
-                try:
-                    item = list.pop()
-                    result.failureExpr = item[1]
-                except:
-                    result.failureExpr = None
-                    return result
-    return result
\ No newline at end of file
+
+def orderedgrepMany(file, exprLists, groupValuesList = None):
+    """Search for several independent sets of ordered matches in an input file using a single pass over the file.
+
+    Each entry in the list of expression lists is evaluated with the same semantics as L{orderedgrep},
+    but the input file is only read once, and reading stops as soon as every expression list has either
+    been fully matched or has failed on a group value mismatch.
+
+    @param file: The full path to the input file
+    @param exprLists: A list of lists of regular expressions (uncompiled) to search for in the input file
+    @param groupValuesList: An optional list of group value dictionaries, one per expression list
+    @returns: A list of results, in the same order as the supplied expression lists
+    @rtype: list
+    @raises FileNotFoundException: Raised if the input file does not exist
+
+    """
+    if groupValuesList == None:
+        groupValuesList = [None] * len(exprLists)
+    assert len(groupValuesList) == len(exprLists), "expected one group value dictionary per expression list"
+    matchers = [OrderedGrepMatcher(e, g) for e, g in zip(exprLists, groupValuesList)]
+    _streamMatchers(file, matchers)
+    return [m.result for m in matchers]
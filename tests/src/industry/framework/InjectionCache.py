@@ -0,0 +1,173 @@
+from __future__ import with_statement
+from pysys.constants import *
+from pysys import log
+import os, hashlib, tempfile, threading
+
+# Default directory holding the cached CDP bundles, shared by all test runs on the host
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'industry-analytics-cdp-cache')
+
+
+class InjectionRecorder:
+	"""Stands in for a correlator to record the injections an inject helper makes.
+
+	MonitorScript injections are recorded as the ordered list of source files. Any other
+	interaction with the correlator is recorded so it can be replayed, and marks the recording
+	as unsuitable for bundling into a single CDP. Attributes of the correlator, such as whether
+	it is pooled, are read from the correlator being injected into, and attributes written by
+	the helper are recorded and always applied to it.
+
+	"""
+	def __init__(self, correlator=None):
+		self.__dict__['correlator'] = correlator
+		self.__dict__['files'] = []
+		self.__dict__['calls'] = []
+		self.__dict__['attributes'] = []
+		self.__dict__['bundleable'] = True
+
+	def injectMonitorscript(self, filenames=[], filedir=None, utf8=FALSE, **xargs):
+		if isinstance(filenames, basestring): filenames = [filenames]
+		for filename in filenames:
+			path = os.path.normpath(os.path.join(filedir, filename)) if filedir != None else filename
+			if not path in self.files: self.files.append(path)
+		self.calls.append(('injectMonitorscript', (filenames, filedir, utf8), xargs))
+		if utf8 or xargs: self.bundleable = False
+
+	def __getattr__(self, name):
+		if name.startswith('__'): raise AttributeError(name)
+		value = getattr(self.correlator, name, None)
+		if value != None and not callable(value): return value
+		def record(*args, **xargs):
+			self.calls.append((name, args, xargs))
+			self.bundleable = False
+		return record
+
+	def __setattr__(self, name, value):
+		if name in self.__dict__:
+			self.__dict__[name] = value
+		else:
+			self.attributes.append((name, value))
+
+	def applyAttributes(self, correlator):
+		for name, value in self.attributes:
+			setattr(correlator, name, value)
+
+	def replay(self, correlator):
+		for name, args, xargs in self.calls:
+			getattr(correlator, name)(*args, **xargs)
+
+
+class InjectionCache:
+	"""A content-hashed cache of CDP bundles built from the dependency closure of an inject helper.
+
+	The key of each bundle is a hash of the paths and contents of its source files, in injection
+	order, so a bundle is rebuilt only when one of its source files changes. Bundles are built with
+	engine_package into a temporary file which is then renamed into place, so concurrent builds of
+	the same bundle by several workers or runners are safe.
+
+	"""
+	def __init__(self, cacheDir=DEFAULT_CACHE_DIR):
+		self.cacheDir = cacheDir
+		self.lock = threading.Lock()
+		self.buildLocks = {}
+		if not os.path.exists(self.cacheDir):
+			try:
+				os.makedirs(self.cacheDir)
+			except OSError:
+				if not os.path.isdir(self.cacheDir): raise
+
+	def getKey(self, files):
+		sha = hashlib.sha1()
+		sha.update(getattr(PROJECT, 'APAMA_HOME', ''))
+		for path in files:
+			sha.update(path)
+			f = open(path, 'rb')
+			try:
+				sha.update(f.read())
+			finally:
+				f.close()
+		return sha.hexdigest()
+
+	def getBundle(self, test, name, files):
+		"""Return the path of the CDP bundle for the given ordered list of source files, building it if required.
+
+		@param test: The test on whose behalf the bundle is built
+		@param name: A descriptive name for the bundle, used in its filename
+		@param files: The ordered list of MonitorScript source files in the bundle
+
+		"""
+		key = self.getKey(files)
+		cdp = os.path.join(self.cacheDir, '%s-%s.cdp' % (name, key))
+		if os.path.exists(cdp): return cdp
+
+		with self.lock:
+			buildLock = self.buildLocks.setdefault(key, threading.Lock())
+		with buildLock:
+			if os.path.exists(cdp): return cdp
+			tmp = '%s.%d.%d.tmp' % (cdp, os.getpid(), threading.currentThread().ident)
+			command = os.path.join(PROJECT.APAMA_HOME, 'bin', 'engine_package')
+			if PLATFORM == 'win32': command = command + '.exe'
+			test.log.info("Building CDP bundle %s from %d files", os.path.basename(cdp), len(files))
+			process = test.startProcess(command, ['--output', tmp] + files, test.environ, test.output,
+										state=FOREGROUND, timeout=TIMEOUTS['WaitForProcess'],
+										stdout=os.path.join(test.output, 'engine_package.out'),
+										stderr=os.path.join(test.output, 'engine_package.err'),
+										displayName='engine_package')
+			if process.exitStatus != 0 or not os.path.exists(tmp):
+				if os.path.exists(tmp): os.remove(tmp)
+				return None
+			try:
+				os.rename(tmp, cdp)
+			except OSError:
+				# Another runner built the same bundle in the meantime
+				os.remove(tmp)
+		return cdp
+
+
+def cachedInjection(helper):
+	"""Decorator for the inject helpers of a test, injecting the helper's dependency closure as one cached CDP.
+
+	When the injection cache is enabled, the helper is first run against an L{InjectionRecorder} to
+	find the ordered set of files it injects, including those injected by any helpers it calls. The
+	files are then injected as a single cached CDP. If the helper does anything other than inject
+	MonitorScript, or the bundle cannot be built, the recorded calls are replayed against the
+	correlator instead.
+
+	"""
+	def inject(test, correlator):
+		cache = getInjectionCache()
+		if cache == None or isinstance(correlator, InjectionRecorder):
+			return helper(test, correlator)
+
+		recorder = InjectionRecorder(correlator)
+		helper(test, recorder)
+		recorder.applyAttributes(correlator)
+		cdp = None
+		if recorder.bundleable and recorder.files:
+			cdp = cache.getBundle(test, helper.__name__, recorder.files)
+		if cdp != None:
+			correlator.injectCDP([os.path.basename(cdp)], os.path.dirname(cdp))
+		else:
+			recorder.replay(correlator)
+	inject.__name__ = helper.__name__
+	inject.__doc__ = helper.__doc__
+	return inject
+
+
+_cache = None
+
+def configure(enabled, cacheDir=DEFAULT_CACHE_DIR):
+	"""Create the process-wide injection cache, or disable it.
+
+	"""
+	global _cache
+	if enabled:
+		_cache = InjectionCache(cacheDir)
+	else:
+		_cache = None
+	return _cache
+
+def getInjectionCache():
+	"""Return the process-wide injection cache, or None if it is not enabled.
+
+	"""
+	return _cache
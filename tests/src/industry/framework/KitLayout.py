@@ -0,0 +1,118 @@
+from __future__ import with_statement
+from pysys.constants import *
+from apama.common import stringToUnicode
+import os, threading
+
+# The kit variants built into the output directory, as the suffix of their attribute names and the
+# text identifying their versioned directory (None for the core kit)
+KIT_VARIANTS = [('', None),
+				('_RETAIL', ' for Retail'),
+				('_MANUFACTURING', ' for Manufacturing'),
+				('_UTILITY', ' for Utility')]
+
+# The directories within each kit, as the prefix of their attribute names and their directory name
+KIT_DIRS = [('COMPONENT_CONFIG_DIR', 'config'),
+			('COMPONENT_EVENT_DEFS_DIR', 'eventdefinitions'),
+			('COMPONENT_OBJECTS_DIR', 'objects'),
+			('COMPONENT_MONITORS_DIR', 'monitors'),
+			('COMPONENT_QUERIES_DIR', 'queries')]
+
+
+def _resolveLayout(componentHome):
+	"""Find the directories of each kit variant in the build output, returning a dictionary of attribute name to path.
+
+	"""
+	outputdir = os.path.join(componentHome, 'output', 'windows')
+	outputdirfolders = [p for p in map(lambda d: os.path.join(outputdir, d), os.listdir(outputdir)) if os.path.isdir(p)]
+
+	layout = {}
+	for suffix, variant in KIT_VARIANTS:
+		if variant == None:
+			version_path = (p for p in outputdirfolders if not ' for ' in os.path.basename(p)).next()
+		else:
+			version_path = (p for p in outputdirfolders if variant in os.path.basename(p)).next()
+		eplHome = os.path.join(version_path, 'Industry Analytics Kit')
+		layout['COMPONENT_EPL_HOME' + suffix] = eplHome
+		for name, dir in KIT_DIRS: layout[name + suffix] = os.path.join(eplHome, dir)
+	return layout
+
+
+def _resolveEnviron(environ):
+	"""Build the environment of the processes started by the tests from the given process environment.
+
+	"""
+	result = {}
+	for key in environ: result[stringToUnicode(key)] = stringToUnicode(environ[key])
+	apamaHome = getattr(PROJECT, "APAMA_HOME")
+	version = getattr(PROJECT, "APAMA_LIBRARY_VERSION")
+	classpath = [os.path.join(apamaHome, 'bin'),
+				 os.path.join(apamaHome, 'lib'),
+				 os.path.join(PROJECT.root, 'tools', 'classes'),
+				 os.path.join(apamaHome, 'lib', 'util%s.jar' % version),
+				 os.path.join(apamaHome, 'lib', 'engine_client%s.jar' % version),
+				 os.path.join(environ['ANT_HOME'], 'lib', 'ant-launcher.jar'),
+				 os.path.join(environ['ANT_HOME']),
+				 '']
+	result['CLASSPATH'] = stringToUnicode(ENVSEPERATOR.join(classpath))
+	return result
+
+
+class KitLayout:
+	"""A process-wide cache of the kit directories in the build output and of the test process environment.
+
+	Resolving the layout lists the build output directory, and building the environment converts every
+	variable of the process environment, so both are done once per runner and shared by every test on
+	every worker thread. The layout is resolved again if the build output directory is modified (e.g. the
+	kit is rebuilt between cycles), and the environment is built again only if one of the few settings it
+	is derived from (C{APAMA_HOME}, the Apama library version, C{ANT_HOME} and the project root) changes.
+
+	"""
+	def __init__(self):
+		self.lock = threading.Lock()
+		self.layout = None
+		self.layoutKey = None
+		self.environ = None
+		self.environKey = None
+
+	def getLayout(self, componentHome):
+		"""Return a dictionary of the kit directory attribute names to their paths.
+
+		"""
+		outputdir = os.path.join(componentHome, 'output', 'windows')
+		key = (os.path.abspath(componentHome), os.stat(outputdir).st_mtime)
+		with self.lock:
+			if self.layoutKey != key:
+				self.layout = _resolveLayout(componentHome)
+				self.layoutKey = key
+			return self.layout
+
+	def getEnviron(self, overrides=None):
+		"""Return the environment for the processes started by a test.
+
+		The shared environment is returned unless overrides are given, in which case a copy with the
+		overrides applied is returned, so that tests adding their own variables do not affect each other.
+		The shared environment must not be modified.
+
+		@param overrides: Optional dictionary of variables to add to or replace in the environment
+
+		"""
+		key = (getattr(PROJECT, "APAMA_HOME"), getattr(PROJECT, "APAMA_LIBRARY_VERSION"),
+			   os.environ.get('ANT_HOME'), PROJECT.root)
+		with self.lock:
+			if self.environKey != key:
+				self.environ = _resolveEnviron(os.environ)
+				self.environKey = key
+			environ = self.environ
+		if not overrides: return environ
+		result = dict(environ)
+		result.update(overrides)
+		return result
+
+
+_layout = KitLayout()
+
+def getKitLayout():
+	"""Return the process-wide kit layout cache.
+
+	"""
+	return _layout
@@ -0,0 +1,131 @@
+from __future__ import with_statement
+import os, threading
+
+from industry.framework.GrepUtils import READ_BUFFER_SIZE, _compile
+
+
+class WatchedFile:
+	"""The state of a single file followed by a L{LogWatcher}.
+
+	Holds the byte offset up to which the file has been read, any trailing partial line that has
+	not yet been terminated, and the matches found so far for each watched expression.
+
+	"""
+	def __init__(self, path):
+		self.path = path
+		self.offset = 0
+		self.partial = ''
+		self.matches = {}
+
+	def reset(self):
+		self.offset = 0
+		self.partial = ''
+		for expr in self.matches: self.matches[expr] = []
+
+	def _match(self, lines, exprs):
+		for line in lines:
+			for expr in exprs:
+				matched = _compile(expr).search(line)
+				if matched != None: self.matches[expr].append(matched)
+
+	def watch(self, expr):
+		"""Start watching an expression, catching up with the part of the file already read.
+
+		"""
+		if self.matches.has_key(expr): return
+		self.matches[expr] = []
+		if self.offset == 0: return
+		f = open(self.path, 'rb')
+		try:
+			remaining = self.offset
+			partial = ''
+			while remaining > 0:
+				data = f.read(min(READ_BUFFER_SIZE, remaining))
+				if not data: break
+				remaining -= len(data)
+				lines = (partial + data).split('\n')
+				partial = lines.pop()
+				self._match([l.rstrip('\r') for l in lines], [expr])
+		finally:
+			f.close()
+
+	def update(self):
+		"""Read and match any data appended to the file since it was last read.
+
+		If the file is now shorter than the offset already read, it is assumed to have been truncated or
+		replaced, and is read again from the start.
+
+		"""
+		if not os.path.exists(self.path): return
+		if os.path.getsize(self.path) < self.offset: self.reset()
+		f = open(self.path, 'rb')
+		try:
+			f.seek(self.offset)
+			while True:
+				data = f.read(READ_BUFFER_SIZE)
+				if not data: break
+				self.offset += len(data)
+				lines = (self.partial + data).split('\n')
+				self.partial = lines.pop()
+				self._match([l.rstrip('\r') for l in lines], self.matches.keys())
+		finally:
+			f.close()
+
+	def getMatches(self, expr):
+		"""Return the matches of an expression, including a match in a trailing partial line.
+
+		"""
+		matches = self.matches[expr]
+		if self.partial:
+			matched = _compile(expr).search(self.partial.rstrip('\r'))
+			if matched != None: return matches + [matched]
+		return matches
+
+
+class LogWatcher:
+	"""Incrementally follows growing files, counting the matches of several expressions at once.
+
+	Each file is read from the byte offset at which it was last read, so repeatedly waiting for
+	expressions in a large log costs a single pass over the log rather than a full rescan per poll.
+	An expression that is first watched after the file has been partly read is matched once against
+	the part already read, so the matches returned are always those in the whole file.
+
+	"""
+	def __init__(self):
+		self.lock = threading.Lock()
+		self.files = {}
+
+	def watch(self, path, exprs):
+		"""Start watching the given expressions in a file, and read any new data from it.
+
+		@param path: The full path to the file
+		@param exprs: The list of regular expressions to watch
+
+		"""
+		with self.lock:
+			watched = self.files.get(path)
+			if watched == None: watched = self.files[path] = WatchedFile(path)
+			if os.path.exists(path):
+				for expr in exprs: watched.watch(expr)
+				watched.update()
+			else:
+				for expr in exprs:
+					if not watched.matches.has_key(expr): watched.matches[expr] = []
+		return watched
+
+	def getMatches(self, path, expr):
+		"""Return the matches of a watched expression in a file, as of when the file was last read.
+
+		"""
+		with self.lock:
+			return self.files[path].getMatches(expr)
+
+	def forget(self, path=None):
+		"""Stop following a file, or all files if no path is given.
+
+		"""
+		with self.lock:
+			if path == None:
+				self.files = {}
+			elif self.files.has_key(path):
+				del self.files[path]
@@ -0,0 +1,200 @@
+from __future__ import with_statement
+import os, shutil, socket, tempfile, threading, time, errno
+from pysys import log
+
+# Default range of ports that can be leased to correlators and adapters started by the tests
+DEFAULT_PORT_RANGE = (21000, 23000)
+
+# Default directory holding the lease files that are shared by all test processes on the host
+DEFAULT_LEASE_DIR = os.path.join(tempfile.gettempdir(), 'industry-analytics-port-leases')
+
+# Default root of the per-worker scratch directories
+DEFAULT_SCRATCH_ROOT = os.path.join(tempfile.gettempdir(), 'industry-analytics-workers')
+
+
+def _isProcessAlive(pid):
+	"""Return true if a process with the given pid is still running on this host.
+
+	"""
+	if os.name == 'nt':
+		import ctypes
+		PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+		STILL_ACTIVE = 259
+		kernel32 = ctypes.windll.kernel32
+		handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+		if not handle: return False
+		try:
+			exitCode = ctypes.c_ulong()
+			if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exitCode)): return True
+			return exitCode.value == STILL_ACTIVE
+		finally:
+			kernel32.CloseHandle(handle)
+	try:
+		os.kill(pid, 0)
+	except OSError, e:
+		return e.errno == errno.EPERM
+	return True
+
+
+def _isPortFree(port):
+	"""Return true if nothing is currently bound to the given port on this host.
+
+	"""
+	s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+	try:
+		try:
+			s.bind(('', port))
+		except socket.error:
+			return False
+		return True
+	finally:
+		s.close()
+
+
+class PortAllocator:
+	"""Allocates TCP ports that are unique across all worker threads and all test processes on a host.
+
+	Each leased port is backed by a lease file created atomically in a shared lease directory, so
+	two runners executing on the same build machine can never be handed the same port. Leases held
+	by processes that are no longer running are reclaimed automatically. Each worker thread starts
+	searching from a different offset within the port range to keep contention between workers low.
+
+	"""
+	def __init__(self, portRange=DEFAULT_PORT_RANGE, leaseDir=DEFAULT_LEASE_DIR, scratchRoot=DEFAULT_SCRATCH_ROOT):
+		self.minPort, self.maxPort = portRange
+		self.leaseDir = leaseDir
+		self.scratchRoot = scratchRoot
+		self.pid = os.getpid()
+		self.lock = threading.Lock()
+		self.leases = {}
+		self.scratchDirs = {}
+		if not os.path.exists(self.leaseDir):
+			try:
+				os.makedirs(self.leaseDir)
+			except OSError:
+				if not os.path.isdir(self.leaseDir): raise
+
+	def _leaseFile(self, port):
+		return os.path.join(self.leaseDir, '%d.lease' % port)
+
+	def _tryLease(self, port, owner):
+		leaseFile = self._leaseFile(port)
+		try:
+			fd = os.open(leaseFile, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+		except OSError, e:
+			if e.errno != errno.EEXIST: raise
+			if not self._reclaimIfStale(leaseFile): return False
+			try:
+				fd = os.open(leaseFile, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+			except OSError:
+				return False
+		try:
+			os.write(fd, '%d %s %f' % (self.pid, owner, time.time()))
+		finally:
+			os.close(fd)
+		if not _isPortFree(port):
+			os.remove(leaseFile)
+			return False
+		return True
+
+	def _reclaimIfStale(self, leaseFile):
+		try:
+			f = open(leaseFile, 'r')
+			try:
+				pid = int(f.read().split()[0])
+			finally:
+				f.close()
+		except (IOError, IndexError, ValueError):
+			# Partially written or removed by its owner in the meantime
+			return False
+		if pid == self.pid or _isProcessAlive(pid): return False
+		try:
+			os.remove(leaseFile)
+		except OSError:
+			return False
+		return True
+
+	def allocate(self, owner=None):
+		"""Lease a free port, returning the port number.
+
+		@param owner: Optional description of the lease holder, recorded in the lease file
+		@raises Exception: Raised if every port in the range is currently leased or bound
+
+		"""
+		worker = threading.currentThread()
+		if owner == None: owner = worker.getName()
+		size = self.maxPort - self.minPort
+		offset = hash((self.pid, worker.ident)) % size
+		for i in range(size):
+			port = self.minPort + (offset + i) % size
+			with self.lock:
+				if self.leases.has_key(port): continue
+				if self._tryLease(port, owner):
+					self.leases[port] = owner
+					return port
+		raise Exception("Unable to lease a free port in the range %d-%d" % (self.minPort, self.maxPort))
+
+	def release(self, port):
+		"""Release a port previously leased by this process.
+
+		"""
+		with self.lock:
+			if not self.leases.has_key(port): return
+			del self.leases[port]
+			try:
+				os.remove(self._leaseFile(port))
+			except OSError:
+				log.warn("Unable to remove lease file for port %d", port)
+
+	def releaseAll(self):
+		"""Release all ports leased by this process.
+
+		"""
+		for port in self.leases.keys(): self.release(port)
+
+	def getScratchDir(self):
+		"""Return the scratch directory of the calling worker thread, creating it if required.
+
+		The directory is unique to the worker and the process, and is reused by every test that runs on the worker.
+
+		"""
+		name = threading.currentThread().getName()
+		with self.lock:
+			scratchDir = self.scratchDirs.get(name)
+			if scratchDir == None:
+				scratchDir = os.path.join(self.scratchRoot, '%d-%s' % (self.pid, name))
+				if not os.path.exists(scratchDir): os.makedirs(scratchDir)
+				self.scratchDirs[name] = scratchDir
+		return scratchDir
+
+	def removeScratchDirs(self):
+		"""Remove the scratch directories created for the worker threads of this process.
+
+		"""
+		with self.lock:
+			for scratchDir in self.scratchDirs.values():
+				shutil.rmtree(scratchDir, ignore_errors=True)
+			self.scratchDirs = {}
+
+
+_allocator = None
+_allocatorLock = threading.Lock()
+
+def configure(portRange=DEFAULT_PORT_RANGE, leaseDir=DEFAULT_LEASE_DIR, scratchRoot=DEFAULT_SCRATCH_ROOT):
+	"""Create the process-wide port allocator with the given settings.
+
+	"""
+	global _allocator
+	with _allocatorLock:
+		_allocator = PortAllocator(portRange, leaseDir, scratchRoot)
+	return _allocator
+
+def getPortAllocator():
+	"""Return the process-wide port allocator, creating one with the default settings if required.
+
+	"""
+	global _allocator
+	with _allocatorLock:
+		if _allocator == None:
+			_allocator = PortAllocator()
+	return _allocator
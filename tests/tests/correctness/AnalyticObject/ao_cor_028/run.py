@@ -0,0 +1,34 @@
+# $Copyright (c) 2015 Software AG, Darmstadt, Germany and/or Software AG USA Inc., Reston, VA, USA, and/or Terracotta Inc., San Francisco, CA, USA, and/or Software AG (Canada) Inc., Cambridge, Ontario, Canada, and/or, Software AG (UK) Ltd., Derby, United Kingdom, and/or Software A.G. (Israel) Ltd., Or-Yehuda, Israel and/or their licensors.$
+# Use, reproduction, transfer, publication or disclosure is prohibited except as specifically provided for in your License Agreement with Software AG
+
+from industry.framework.AnalyticsBaseTest import AnalyticsBaseTest
+from pysys.constants import *
+
+
+class PySysTest(AnalyticsBaseTest):
+	def execute(self):
+		# Start the correlator
+		correlator = self.startTest(logfile="correlator.log", inputLog="input.log")
+		self.injectAnalytic(correlator)
+		self.injectDelta(correlator)
+		self.ready(correlator)
+		correlator.receive(filename='Output.evt', channels=['Output'])
+
+		correlator.send('Config.evt')
+		self.waitForSignal('correlator.log',
+						   expr='Analytic Delta started for inputDataNames',
+						   condition='==3',
+						   timeout=5)
+
+		correlator.send('Events.evt')
+		self.waitForSignal('Output.evt', expr='com\.industry\.analytics\.Data\(', condition='==15', timeout=5)
+
+		
+	def validate(self):
+		# The shards process the sourceIds in parallel, so only the order for each sourceId is fixed
+		for sourceId in ['s1', 's2', 's3', 's4', 's5']:
+			self.assertLineCount('Output.evt', expr='"%s"' % sourceId, condition='==3')
+			self.assertDiff('Output.evt', 'Output.evt', includes=['"%s"' % sourceId])
+		self.assertLineCount('correlator.log', expr='Analytic Delta sharded across 3 contexts', condition='==1')
+		self.assertLineCount('correlator.log', expr='Analytic Delta started for inputDataNames', condition='==3')
+		self.checkSanity()
@@ -0,0 +1,37 @@
+# $Copyright (c) 2015 Software AG, Darmstadt, Germany and/or Software AG USA Inc., Reston, VA, USA, and/or Terracotta Inc., San Francisco, CA, USA, and/or Software AG (Canada) Inc., Cambridge, Ontario, Canada, and/or, Software AG (UK) Ltd., Derby, United Kingdom, and/or Software A.G. (Israel) Ltd., Or-Yehuda, Israel and/or their licensors.$
+# Use, reproduction, transfer, publication or disclosure is prohibited except as specifically provided for in your License Agreement with Software AG
+
+from industry.framework.AnalyticsBaseTest import AnalyticsBaseTest
+from pysys.constants import *
+
+
+class PySysTest(AnalyticsBaseTest):
+	def execute(self):
+		# Start the correlator
+		correlator = self.startTest(logfile="correlator.log", inputLog="input.log")
+		self.injectAnalytic(correlator)
+		self.injectAverage(correlator)
+		self.ready(correlator)
+		correlator.receive(filename='Output.evt', channels=['Output'])
+
+		correlator.send('Config.evt')
+		self.waitForSignal('correlator.log',
+						   expr='Analytic Average started for inputDataNames',
+						   condition='==1',
+						   timeout=5)
+
+		correlator.send('Events.evt')
+		self.waitForSignal('correlator.log',
+						   expr='Analytic Average stopped for inputDataNames',
+						   condition='==1',
+						   timeout=5)
+		self.waitForSignal('input.log', expr='com\.industry\.analytics\.Data\(', condition='==8', timeout=5)
+
+		
+	def validate(self):
+		# Each partial batch was processed before the reset or stop, and nothing after the stop
+		self.assertDiff('Output.evt', 'Output.evt')
+		self.assertLineCount('Output.evt', expr='com\.industry\.analytics\.Data\(', condition='==6')
+		self.assertOrderedGrep('correlator.log', exprList=['Average using managementId avg has been reset',
+														   'Analytic Average stopped for inputDataNames'])
+		self.checkSanity()
@@ -0,0 +1,37 @@
+# $Copyright (c) 2015 Software AG, Darmstadt, Germany and/or Software AG USA Inc., Reston, VA, USA, and/or Terracotta Inc., San Francisco, CA, USA, and/or Software AG (Canada) Inc., Cambridge, Ontario, Canada, and/or, Software AG (UK) Ltd., Derby, United Kingdom, and/or Software A.G. (Israel) Ltd., Or-Yehuda, Israel and/or their licensors.$
+# Use, reproduction, transfer, publication or disclosure is prohibited except as specifically provided for in your License Agreement with Software AG
+
+from industry.framework.AnalyticsBaseTest import AnalyticsBaseTest
+from pysys.constants import *
+
+
+class PySysTest(AnalyticsBaseTest):
+	def execute(self):
+		# Start the correlator
+		correlator = self.startTest(logfile="correlator.log", inputLog="input.log")
+		self.injectAnalytic(correlator)
+		self.injectAverage(correlator)
+		self.ready(correlator)
+		correlator.receive(filename='Output.evt', channels=['Output'])
+		correlator.receive(filename='Statistics.evt', channels=['com.industry.analytics.statistics'])
+
+		correlator.send('Config.evt')
+		self.waitForSignal('correlator.log',
+						   expr='Analytic Average started for inputDataNames',
+						   condition='==1',
+						   timeout=5)
+
+		correlator.send('Events.evt')
+		self.waitForSignal('Statistics.evt', expr='com\.industry\.analytics\.Data\(', condition='==4', timeout=5)
+
+		
+	def validate(self):
+		# The processing times vary, so only the counts are checked
+		self.assertLineCount('Output.evt', expr='com\.industry\.analytics\.Data\(', condition='==5')
+		self.assertLineCount('Statistics.evt', expr='com\.industry\.analytics\.Data\(', condition='==4')
+		self.assertOrderedGrep('Statistics.evt', exprList=[
+			'"avg",1,3,"Average",3,[^,]+,2,\{"bufferedItems":"0","in\.Input":"3",.*"started":"true","timedEvents":"3"\}',
+			'"avg",2,5,"Average",5,[^,]+,2,\{"bufferedItems":"0","in\.Input":"5",.*"started":"true","timedEvents":"5"\}',
+			'"avg",3,5,"Average",5,[^,]+,2,\{"bufferedItems":"0","in\.Input":"5",.*"started":"true","timedEvents":"5"\}',
+			'"avg",5,5,"Average",5,[^,]+,2,\{"bufferedItems":"0","in\.Input":"5",.*"started":"false","timedEvents":"5"\}'])
+		self.checkSanity()
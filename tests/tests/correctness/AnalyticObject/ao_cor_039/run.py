@@ -0,0 +1,37 @@
+# $Copyright (c) 2015 Software AG, Darmstadt, Germany and/or Software AG USA Inc., Reston, VA, USA, and/or Terracotta Inc., San Francisco, CA, USA, and/or Software AG (Canada) Inc., Cambridge, Ontario, Canada, and/or, Software AG (UK) Ltd., Derby, United Kingdom, and/or Software A.G. (Israel) Ltd., Or-Yehuda, Israel and/or their licensors.$
+# Use, reproduction, transfer, publication or disclosure is prohibited except as specifically provided for in your License Agreement with Software AG
+
+from industry.framework.AnalyticsBaseTest import AnalyticsBaseTest
+from pysys.constants import *
+
+
+class PySysTest(AnalyticsBaseTest):
+	def execute(self):
+		# Start the correlator
+		correlator = self.startTest(logfile="correlator.log", inputLog="input.log")
+		self.injectAnalytic(correlator)
+		self.injectDelta(correlator)
+		self.ready(correlator)
+		correlator.receive(filename='Output.evt', channels=['Output'])
+		correlator.receive(filename='Statistics.evt', channels=['com.industry.analytics.statistics'])
+
+		correlator.send('Config.evt')
+		self.waitForSignal('correlator.log',
+						   expr='Analytic Delta started for inputDataNames',
+						   condition='==3',
+						   timeout=5)
+
+		correlator.send('Events.evt')
+		self.waitForSignal('Output.evt', expr='com\.industry\.analytics\.Data\(', condition='==15', timeout=5)
+
+		correlator.send('Management.evt')
+		self.waitForSignal('Statistics.evt', expr='com\.industry\.analytics\.Data\(', condition='==3', timeout=5)
+
+		
+	def validate(self):
+		# The sourceIds are assigned to the shards in turn, and each Data event is only counted by its shard
+		self.assertLineCount('Statistics.evt', expr='"in\.Input":"8".*"out\.Output":"6","shardIndex":"0"', condition='==1')
+		self.assertLineCount('Statistics.evt', expr='"in\.Input":"8".*"out\.Output":"6","shardIndex":"1"', condition='==1')
+		self.assertLineCount('Statistics.evt', expr='"in\.Input":"4".*"out\.Output":"3","shardIndex":"2"', condition='==1')
+		self.assertLineCount('correlator.log', expr='Analytic Delta sharded across 3 contexts', condition='==1')
+		self.checkSanity()
@@ -0,0 +1,31 @@
+# $Copyright (c) 2015 Software AG, Darmstadt, Germany and/or Software AG USA Inc., Reston, VA, USA, and/or Terracotta Inc., San Francisco, CA, USA, and/or Software AG (Canada) Inc., Cambridge, Ontario, Canada, and/or, Software AG (UK) Ltd., Derby, United Kingdom, and/or Software A.G. (Israel) Ltd., Or-Yehuda, Israel and/or their licensors.$
+# Use, reproduction, transfer, publication or disclosure is prohibited except as specifically provided for in your License Agreement with Software AG
+
+from industry.framework.AnalyticsBaseTest import AnalyticsBaseTest
+from pysys.constants import *
+
+
+class PySysTest(AnalyticsBaseTest):
+	def execute(self):
+		# Start the correlator
+		correlator = self.startTest(logfile="correlator.log", inputLog="input.log")
+		self.injectAnalytic(correlator)
+		self.injectDelta(correlator)
+		self.ready(correlator)
+		correlator.receive(filename='Output.evt', channels=['Output'])
+		correlator.receive(filename='Statistics.evt', channels=['com.industry.analytics.statistics'])
+
+		correlator.injectMonitorscript(['test.mon'], self.input)
+		self.waitForSignal('correlator.log', expr='TEST COMPLETE', condition='==1', timeout=5)
+		self.waitForSignal('Output.evt', expr='com\.industry\.analytics\.Data\(', condition='==2', timeout=5)
+
+		correlator.send('Management.evt')
+		self.waitForSignal('Statistics.evt', expr='com\.industry\.analytics\.Data\(', condition='==1', timeout=5)
+
+		
+	def validate(self):
+		# Every Data event passed to processData is counted and timed
+		self.assertGrep('Statistics.evt', expr='"in\.Input":"3"')
+		self.assertGrep('Statistics.evt', expr='"out\.Output":"2"')
+		self.assertGrep('Statistics.evt', expr='"timedEvents":"3"')
+		self.checkSanity()
@@ -0,0 +1,30 @@
+# $Copyright (c) 2015 Software AG, Darmstadt, Germany and/or Software AG USA Inc., Reston, VA, USA, and/or Terracotta Inc., San Francisco, CA, USA, and/or Software AG (Canada) Inc., Cambridge, Ontario, Canada, and/or, Software AG (UK) Ltd., Derby, United Kingdom, and/or Software A.G. (Israel) Ltd., Or-Yehuda, Israel and/or their licensors.$
+# Use, reproduction, transfer, publication or disclosure is prohibited except as specifically provided for in your License Agreement with Software AG
+
+from industry.framework.AnalyticsBaseTest import AnalyticsBaseTest
+from pysys.constants import *
+
+
+class PySysTest(AnalyticsBaseTest):
+	def execute(self):
+		# Start the correlator
+		correlator = self.startTest()
+		self.injectAnalytic(correlator)
+		self.injectEventRate(correlator)
+		self.ready(correlator)
+		correlator.receive(filename='Output.evt', channels=['Output'])
+
+		correlator.send('Config.evt')
+		self.waitForSignal('correlator.out',
+						   expr='Analytic EventRate started for inputDataNames',
+						   condition='==1',
+						   timeout=5)
+		# Move the time on by 10 ticks of 0.1 seconds
+		correlator.incrementTime(0.1, count=10)
+		self.waitForSignal('Output.evt', expr='com.industry.analytics\.Data', condition='==10', timeout=5)
+
+	def validate(self):
+		# An event rate of 0 should have been published on every tick
+		self.assertLineCount('Output.evt', expr='com.industry.analytics\.Data\("Output","c","",.*,0,"",0,0,0,{}\)', condition='==10')
+		
+		self.checkSanity()	
@@ -0,0 +1,43 @@
+# $Copyright (c) 2015 Software AG, Darmstadt, Germany and/or Software AG USA Inc., Reston, VA, USA, and/or Terracotta Inc., San Francisco, CA, USA, and/or Software AG (Canada) Inc., Cambridge, Ontario, Canada, and/or, Software AG (UK) Ltd., Derby, United Kingdom, and/or Software A.G. (Israel) Ltd., Or-Yehuda, Israel and/or their licensors.$
+# Use, reproduction, transfer, publication or disclosure is prohibited except as specifically provided for in your License Agreement with Software AG
+
+from industry.framework.AnalyticsBaseTest import AnalyticsBaseTest
+from pysys.constants import *
+
+
+class PySysTest(AnalyticsBaseTest):
+	def execute(self):
+		# Start the correlator
+		correlator = self.startTest()
+		self.injectAnalytic(correlator)
+		self.injectFFTAnalysis(correlator)
+		self.ready(correlator)
+
+		correlator.receive(filename='FFT.evt', channels=['Output1'])
+
+		correlator.send('Config.evt')
+		self.waitForSignal('correlator.out',
+						   expr='Analytic FFT started for inputDataNames',
+						   condition='==1',
+						   timeout=5)
+
+		correlator.send('Events.evt')
+		self.waitForSignal('FFT.evt', expr='com.industry.analytics\.Data', condition='==16', timeout=10)
+
+	def validate(self):
+		# Make sure there were no errors in the logs
+		self.checkSanity()
+
+		# Make sure that the peaks were published every 2 samples once the time window was full
+		self.assertLineCount('FFT.evt', expr='com.industry.analytics\.Data', condition='==16')
+		self.assertLineCount('FFT.evt', expr='com.industry.analytics\.Data\("Output1","c","s1",9,', condition='==2')
+		self.assertLineCount('FFT.evt', expr='com.industry.analytics\.Data\("Output1","c","s1",11,', condition='==2')
+		self.assertLineCount('FFT.evt', expr='com.industry.analytics\.Data\("Output1","c","s1",13,', condition='==2')
+		self.assertLineCount('FFT.evt', expr='com.industry.analytics\.Data\("Output1","c","s1",15,', condition='==2')
+		self.assertLineCount('FFT.evt', expr='com.industry.analytics\.Data\("Output1","c","s1",17,', condition='==2')
+		self.assertLineCount('FFT.evt', expr='com.industry.analytics\.Data\("Output1","c","s1",19,', condition='==2')
+		self.assertLineCount('FFT.evt', expr='com.industry.analytics\.Data\("Output1","c","s1",21,', condition='==2')
+		self.assertLineCount('FFT.evt', expr='com.industry.analytics\.Data\("Output1","c","s1",23,', condition='==2')
+
+		# Make sure that the frequencies and amplitudes were as expected
+		self.assertDiff('FFT.evt', 'FFT.evt', relTolerance=1e-6, absTolerance=1e-6)
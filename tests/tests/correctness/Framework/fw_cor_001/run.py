@@ -0,0 +1,28 @@
+# $Copyright (c) 2015 Software AG, Darmstadt, Germany and/or Software AG USA Inc., Reston, VA, USA, and/or Terracotta Inc., San Francisco, CA, USA, and/or Software AG (Canada) Inc., Cambridge, Ontario, Canada, and/or, Software AG (UK) Ltd., Derby, United Kingdom, and/or Software A.G. (Israel) Ltd., Or-Yehuda, Israel and/or their licensors.$
+# Use, reproduction, transfer, publication or disclosure is prohibited except as specifically provided for in your License Agreement with Software AG
+
+from industry.framework.AnalyticsBaseTest import AnalyticsBaseTest
+from industry.framework.DataDiff import tolerantDiff
+from pysys.constants import *
+
+
+class PySysTest(AnalyticsBaseTest):
+	def execute(self):
+		# Nothing to run, the files compared are in the Input and Reference directories
+		pass
+
+		
+	def validate(self):
+		includes = ['"s1"', '"s2"']
+
+		# The s3 lines differ, but are not compared
+		self.assertDiff('Output.evt', 'Output.evt', filedir1=self.input, includes=includes)
+
+		# The last s2 line differs, and is found even though it does not match the s1 expression
+		result = tolerantDiff(os.path.join(self.input, 'Output.evt'), os.path.join(self.reference, 'Different.evt'),
+							  includes=includes)
+		self.log.info("Found %d differing lines, expected 1", result.count)
+		if result.count == 1 and result.differences[0][0] == 4:
+			self.addOutcome(PASSED)
+		else:
+			self.addOutcome(FAILED)
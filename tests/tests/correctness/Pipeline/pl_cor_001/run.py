@@ -0,0 +1,41 @@
+# $Copyright (c) 2017 Software AG, Darmstadt, Germany and/or its licensors.$
+# Use, reproduction, transfer, publication or disclosure is prohibited except as specifically provided for in your License Agreement with Software AG
+
+from industry.framework.AnalyticsBaseTest import AnalyticsBaseTest
+from pysys.constants import *
+
+
+class PySysTest(AnalyticsBaseTest):
+	def execute(self):
+		# Start the correlator
+		correlator = self.startTest(logfile="correlator.log", inputLog="input.log")
+		self.injectAnalytic(correlator)
+		self.injectPipeline(correlator)
+		self.ready(correlator)
+		correlator.receive(filename='Mid.evt', channels=['Mid'])
+		correlator.receive(filename='Out.evt', channels=['Out'])
+		correlator.receive(filename='Tap.evt', channels=['Tap'])
+		correlator.receive(filename='TapOut.evt', channels=['TapOut'])
+
+		correlator.send('Config.evt')
+		self.waitForSignal('correlator.log',
+						   expr='Pipeline .* started with 2 stages',
+						   condition='==2',
+						   timeout=5)
+		self.waitForSignal('correlator.log', expr='Error spawning Pipeline instance', condition='==2', timeout=5)
+
+		correlator.send('Events.evt')
+		self.waitForSignal('Out.evt', expr='com\.industry\.analytics\.Data\(', condition='==3', timeout=5)
+		self.waitForSignal('TapOut.evt', expr='com\.industry\.analytics\.Data\(', condition='==3', timeout=5)
+
+		
+	def validate(self):
+		self.assertDiff('Out.evt', 'Out.evt')
+		self.assertDiff('Tap.evt', 'Tap.evt')
+		self.assertDiff('TapOut.evt', 'TapOut.evt')
+		self.assertLineCount('Mid.evt', expr='com\.industry\.analytics\.Data\(', condition='==0')
+
+		self.assertGrep('correlator.log', expr='Pipeline Empty must define at least one stage')
+		self.assertGrep('correlator.log', expr='Pipeline Unknown stage 0 uses the Analytic NotAnAnalytic, which cannot be used in a Pipeline')
+		self.assertLineCount('correlator.log', expr='Analytic Delta started for inputDataNames', condition='==4')
+		self.checkSanity()
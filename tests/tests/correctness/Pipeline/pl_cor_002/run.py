@@ -0,0 +1,44 @@
+# $Copyright (c) 2017 Software AG, Darmstadt, Germany and/or its licensors.$
+# Use, reproduction, transfer, publication or disclosure is prohibited except as specifically provided for in your License Agreement with Software AG
+
+from industry.framework.AnalyticsBaseTest import AnalyticsBaseTest
+from pysys.constants import *
+
+
+class PySysTest(AnalyticsBaseTest):
+	def execute(self):
+		# Start the correlator
+		correlator = self.startTest(logfile="correlator.log", inputLog="input.log")
+		self.injectAnalytic(correlator)
+		self.injectPipeline(correlator)
+		self.ready(correlator)
+		correlator.receive(filename='First.evt', channels=['First'])
+		correlator.receive(filename='Middle.evt', channels=['Middle'])
+		correlator.receive(filename='Out.evt', channels=['Out'])
+		correlator.receive(filename='Statistics.evt', channels=['com.industry.analytics.statistics'])
+
+		correlator.send('Config.evt')
+		self.waitForSignal('correlator.log',
+						   expr='Pipeline Stoppable started with 3 stages',
+						   condition='==1',
+						   timeout=5)
+
+		correlator.send('Events.evt')
+		self.waitForSignal('Out.evt', expr='com\.industry\.analytics\.Data\(', condition='==2', timeout=5)
+
+		correlator.send('Stop.evt')
+		self.waitForSignal('Statistics.evt', expr='com\.industry\.analytics\.Data\(', condition='==1', timeout=5)
+		
+		# The first stage carries on, but the stopped stage ignores its output
+		correlator.send('MoreEvents.evt')
+		self.waitForSignal('First.evt', expr='com\.industry\.analytics\.Data\(', condition='==6', timeout=5)
+
+		
+	def validate(self):
+		self.assertDiff('First.evt', 'First.evt')
+		self.assertDiff('Middle.evt', 'Middle.evt')
+		self.assertDiff('Out.evt', 'Out.evt')
+		self.assertGrep('Statistics.evt', expr='"in.First":"4"')
+		self.assertGrep('Statistics.evt', expr='"started":"false"')
+		self.assertLineCount('correlator.log', expr='Analytic Delta stopped for inputDataNames', condition='==1')
+		self.checkSanity()
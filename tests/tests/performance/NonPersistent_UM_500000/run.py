@@ -64,4 +64,4 @@ class PySysTest(AnalyticsBaseTest):
 	def validate(self):
 		self.checkSanity(correlatorLog='simulatorCorrelator.log')
 		self.checkSanity(correlatorLog='AnalyticCorrelator.log')
-		self.addOutcome(INSPECT)
+		self.assertBenchmark(eventRateFile='EventRate.evt', correlatorLog='AnalyticCorrelator.log')
@@ -30,4 +30,4 @@ class PySysTest(AnalyticsBaseTest):
 		
 	def validate(self):
 		self.checkSanity()	
-		self.addOutcome(INSPECT)
+		self.assertBenchmark(eventRateFile='EventRate.evt', correlatorLog='correlator.out')